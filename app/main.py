@@ -37,38 +37,6 @@ async def lifespan(app: FastAPI):
         logger.info("Scheduler shutdown complete")
 
 
-app = FastAPI(
-    title=settings.app_name,
-    description="Low-activity investment service for MOEX",
-    version=settings.version,
-    debug=settings.debug,
-    docs_url=settings.docs_url if not settings.environment == "production" else None,
-    redoc_url=settings.redoc_url if not settings.environment == "production" else None,
-    lifespan=lifespan,
-)
-
-# Добавляем CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=settings.cors_credentials,
-    allow_methods=settings.cors_methods,
-    allow_headers=settings.cors_headers,
-)
-
-app.include_router(
-    marketdata_router, prefix=f"{settings.api_prefix}/marketdata", tags=["MarketData"]
-)
-app.include_router(
-    portfolio_router, prefix=f"{settings.api_prefix}/portfolio", tags=["Portfolio"]
-)
-app.include_router(
-    strategy_router, prefix=f"{settings.api_prefix}/strategies", tags=["Strategy"]
-)
-app.include_router(reporting_router, prefix=settings.api_prefix, tags=["Reporting"])
-
-
-@app.get("/")
 async def root():
     """Health check endpoint"""
     return {
@@ -79,7 +47,6 @@ async def root():
     }
 
 
-@app.get("/health")
 async def health():
     """Health check endpoint"""
     return {
@@ -89,7 +56,6 @@ async def health():
     }
 
 
-@app.get("/config")
 async def get_config():
     """Получение текущей конфигурации (без секретных данных)"""
     if settings.environment == "production":
@@ -129,3 +95,51 @@ async def get_config():
             "cache_ttl_minutes": settings.reporting.cache_ttl_minutes,
         },
     }
+
+
+def create_app(lifespan=lifespan) -> FastAPI:
+    """Создание FastAPI приложения с роутерами, CORS и служебными endpoints"""
+    docs_enabled = not settings.environment == "production"
+
+    application = FastAPI(
+        title=settings.app_name,
+        description="Low-activity investment service for MOEX",
+        version=settings.version,
+        debug=settings.debug,
+        docs_url=settings.docs_url if docs_enabled else None,
+        redoc_url=settings.redoc_url if docs_enabled else None,
+        lifespan=lifespan,
+    )
+
+    # Добавляем CORS middleware
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=settings.cors_credentials,
+        allow_methods=settings.cors_methods,
+        allow_headers=settings.cors_headers,
+    )
+
+    application.include_router(
+        marketdata_router,
+        prefix=f"{settings.api_prefix}/marketdata",
+        tags=["MarketData"],
+    )
+    application.include_router(
+        portfolio_router, prefix=f"{settings.api_prefix}/portfolio", tags=["Portfolio"]
+    )
+    application.include_router(
+        strategy_router, prefix=f"{settings.api_prefix}/strategies", tags=["Strategy"]
+    )
+    application.include_router(
+        reporting_router, prefix=settings.api_prefix, tags=["Reporting"]
+    )
+
+    application.get("/")(root)
+    application.get("/health")(health)
+    application.get("/config")(get_config)
+
+    return application
+
+
+app = create_app()
@@ -1,7 +1,8 @@
+import sys
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 
 
 class Security(BaseModel):
@@ -14,6 +15,14 @@ class Security(BaseModel):
     is_active: bool = True
     created_at: datetime = datetime.now()
 
+    @validator("secid")
+    def intern_secid(cls, v):
+        # При повторных синхронизациях с MOEX все объекты инструмента делят одну строку secid
+        return sys.intern(v)
+
+    class Config:
+        frozen = True
+
 
 class Quote(BaseModel):
     secid: str
@@ -22,3 +31,6 @@ class Quote(BaseModel):
     volume: Optional[Decimal] = None
     bid: Optional[Decimal] = None
     ask: Optional[Decimal] = None
+
+    class Config:
+        frozen = True
@@ -14,6 +14,9 @@ class Portfolio(BaseModel):
     created_at: datetime = datetime.now()
     updated_at: datetime = datetime.now()
 
+    class Config:
+        frozen = True
+
 
 class Position(BaseModel):
     id: int
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 from app.modules.marketdata.models import Security, Quote
 from app.modules.portfolio.models import Portfolio, Position
 
@@ -17,6 +17,10 @@ class DataManager:
         self._positions_store: Dict[int, Position] = {}
         self._transactions_store: Dict[int, "Transaction"] = {}
 
+        # Indexes by portfolio_id, kept in sync by add_* and clear_all
+        self._positions_by_portfolio: Dict[int, Dict[int, Position]] = {}
+        self._transactions_by_portfolio: Dict[int, Dict[int, "Transaction"]] = {}
+
         # Strategy stores
         self._strategies_store: Dict[int, "Strategy"] = {}
         self._portfolio_strategies_store: Dict[int, "PortfolioStrategy"] = {}
@@ -75,14 +79,15 @@ class DataManager:
         return self._positions_store.get(position_id)
 
     def add_position(self, position: Position) -> None:
+        self._reindex(self._positions_store, self._positions_by_portfolio, position)
         self._positions_store[position.id] = position
 
+    def add_positions_bulk(self, positions: List[Position]) -> None:
+        for pos in positions:
+            self.add_position(pos)
+
     def get_positions_for_portfolio(self, portfolio_id: int) -> List[Position]:
-        return [
-            pos
-            for pos in self._positions_store.values()
-            if pos.portfolio_id == portfolio_id
-        ]
+        return list(self._positions_by_portfolio.get(portfolio_id, {}).values())
 
     def get_all_positions(self) -> List[Position]:
         return list(self._positions_store.values())
@@ -108,14 +113,13 @@ class DataManager:
         return self._transactions_store.get(transaction_id)
 
     def add_transaction(self, transaction: "Transaction") -> None:
+        self._reindex(
+            self._transactions_store, self._transactions_by_portfolio, transaction
+        )
         self._transactions_store[transaction.id] = transaction
 
     def get_transactions_for_portfolio(self, portfolio_id: int) -> List["Transaction"]:
-        return [
-            tx
-            for tx in self._transactions_store.values()
-            if tx.portfolio_id == portfolio_id
-        ]
+        return list(self._transactions_by_portfolio.get(portfolio_id, {}).values())
 
     def get_all_transactions(self) -> List["Transaction"]:
         return list(self._transactions_store.values())
@@ -125,6 +129,16 @@ class DataManager:
         self._next_transaction_id += 1
         return next_id
 
+    @staticmethod
+    def _reindex(
+        store: Dict[int, Any], index: Dict[int, Dict[int, Any]], obj: Any
+    ) -> None:
+        """Move obj into its portfolio_id bucket, dropping it from the previous one"""
+        previous = store.get(obj.id)
+        if previous is not None and previous.portfolio_id != obj.portfolio_id:
+            index[previous.portfolio_id].pop(previous.id, None)
+        index.setdefault(obj.portfolio_id, {})[obj.id] = obj
+
     def clear_all(self) -> None:
         """Clear all data - useful for testing"""
         self._securities_store.clear()
@@ -132,6 +146,8 @@ class DataManager:
         self._portfolios_store.clear()
         self._positions_store.clear()
         self._transactions_store.clear()
+        self._positions_by_portfolio.clear()
+        self._transactions_by_portfolio.clear()
         self._strategies_store.clear()
         self._portfolio_strategies_store.clear()
         self._next_security_id = 1
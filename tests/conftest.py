@@ -1,6 +1,13 @@
 import pytest
+import pytest_asyncio
 import asyncio
+from contextlib import asynccontextmanager
 from typing import Generator
+from unittest.mock import MagicMock, create_autospec
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 
 from app.storage import DataManager
 
@@ -12,11 +19,108 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@pytest.fixture(scope="session")
+def real_app() -> FastAPI:
+    """Реальное приложение app.main, импортируется только тестами, которым оно нужно"""
+    from app.main import app
+
+    return app
+
+
+@asynccontextmanager
+async def app_lifespan_for_tests(app: FastAPI):
+    """Lifespan для тестов без планировщика"""
+    yield
+
+
+def create_test_app() -> FastAPI:
+    """Создание тестового приложения без планировщика"""
+    # Фабрика импортируется лениво, чтобы сбор тестов не тянул модули приложения
+    from app.main import create_app
+
+    return create_app(lifespan=app_lifespan_for_tests)
+
+
+@pytest.fixture(scope="session")
+def test_app() -> FastAPI:
+    """Тестовое приложение без планировщика, одно на всю сессию"""
+    app = create_test_app()
+    # Схема строится сразу, /openapi.json и /docs дальше отдают кэш app.openapi_schema
+    app.openapi()
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(test_app):
+    """Общий тестовый клиент FastAPI на всю сессию
+
+    Используется как контекстный менеджер, чтобы портал event loop
+    запускался один раз, а не на каждый запрос. Клиент строится на
+    тестовом приложении, поэтому планировщик MOEX не стартует.
+    """
+    with TestClient(test_app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def aclient(test_app):
+    """Асинхронный клиент тестового приложения без планировщика на всю сессию
+
+    Запросы идут напрямую в ASGI приложение, без портала TestClient.
+    Lifespan тестового приложения пустой, поэтому отдельно не запускается.
+    """
+    transport = httpx.ASGITransport(app=test_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(test_app):
+    """OpenAPI схема тестового приложения, генерируется один раз на сессию"""
+    return test_app.openapi()
+
+
+@pytest.fixture(scope="session")
+def _scheduler_autospec():
+    """Автоспека AsyncIOScheduler, иерархия apscheduler обходится один раз на сессию"""
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    return create_autospec(AsyncIOScheduler, instance=True, spec_set=True)
+
+
+@pytest.fixture
+def scheduler_mock(_scheduler_autospec):
+    """Мок планировщика со сброшенными вызовами, return_value и side_effect"""
+    _scheduler_autospec.reset_mock(return_value=True, side_effect=True)
+    return _scheduler_autospec
+
+
+@pytest.fixture
+def patched_settings(monkeypatch):
+    """Мок настроек, подставленный в app.scheduler"""
+    mock_settings = MagicMock()
+    monkeypatch.setattr("app.scheduler.settings", mock_settings)
+    return mock_settings
+
+
 @pytest.fixture
 def data_manager():
     return DataManager()
 
 
+@pytest.fixture(scope="session")
+def _shared_data_manager():
+    """DataManager, создаваемый один раз за сессию"""
+    return DataManager()
+
+
+@pytest.fixture
+def clean_data_manager(_shared_data_manager):
+    """Общий DataManager, очищенный clear_all перед каждым тестом"""
+    _shared_data_manager.clear_all()
+    return _shared_data_manager
+
+
 @pytest.fixture
 def sample_security_data():
     return {
@@ -14,19 +14,8 @@ from app.modules.reporting.service import ReportingService
 def clean_data_manager():
     """Чистый DataManager для каждого теста"""
     dm = DataManager()
-    # Очищаем все данные
-    dm._portfolios_store.clear()
-    dm._positions_store.clear()
-    dm._securities_store.clear()
-    dm._quotes_store.clear()
-    dm._transactions_store.clear()
-    
-    # Сбрасываем счетчики ID
-    dm._next_portfolio_id = 1
-    dm._next_position_id = 1
-    dm._next_security_id = 1
-    dm._next_quote_id = 1
-    dm._next_transaction_id = 1
+    # Очищаем все данные, индексы и счетчики ID
+    dm.clear_all()
     
     return dm
 
@@ -5,13 +5,21 @@ import os
 from decimal import Decimal
 from datetime import datetime
 from unittest.mock import patch, MagicMock
-from fastapi.testclient import TestClient
 
-from app.main import app
 from app.storage import get_data_manager
 from app.modules.portfolio.models import Portfolio, Position
 from app.modules.marketdata.models import Security, Quote
 
+# Ценные бумаги не изменяются сервисами, поэтому создаются один раз на модуль
+SECURITIES = (
+    Security(id=1, secid="SBER", name="Сбербанк", isin="RU0009029540"),
+    Security(id=2, secid="GAZP", name="Газпром", isin="RU0007661625"),
+    Security(id=3, secid="SU26238RMFS2", name="ОФЗ 26238", isin="RU000A103X66"),
+)
+
+# Время котировок в отчетах не проверяется, фиксированное значение делает тесты детерминированными
+QUOTE_TIMESTAMP = datetime(2024, 1, 1, 12, 0, 0)
+
 
 class TestReportingAPIEndpoints:
     """Тесты для API эндпоинтов отчетности"""
@@ -23,10 +31,7 @@ class TestReportingAPIEndpoints:
         data_manager = get_data_manager()
         
         # Очищаем все данные
-        data_manager._portfolios_store.clear()
-        data_manager._positions_store.clear()
-        data_manager._securities_store.clear()
-        data_manager._quotes_store.clear()
+        data_manager.clear_all()
         
         # Создаем тестовые данные
         portfolio = Portfolio(
@@ -37,12 +42,7 @@ class TestReportingAPIEndpoints:
         data_manager.add_portfolio(portfolio)
         
         # Добавляем ценные бумаги
-        securities = [
-            Security(id=1, secid="SBER", name="Сбербанк", isin="RU0009029540"),
-            Security(id=2, secid="GAZP", name="Газпром", isin="RU0007661625"),
-            Security(id=3, secid="SU26238RMFS2", name="ОФЗ 26238", isin="RU000A103X66")
-        ]
-        for security in securities:
+        for security in SECURITIES:
             data_manager.add_security(security)
         
         # Добавляем позиции
@@ -77,30 +77,25 @@ class TestReportingAPIEndpoints:
             Quote(
                 id=1,
                 secid="SBER",
-                timestamp=datetime.now(),
+                timestamp=QUOTE_TIMESTAMP,
                 price=Decimal("260.50")
             ),
             Quote(
                 id=2,
                 secid="GAZP",
-                timestamp=datetime.now(),
+                timestamp=QUOTE_TIMESTAMP,
                 price=Decimal("175.30")
             ),
             Quote(
                 id=3,
                 secid="SU26238RMFS2",
-                timestamp=datetime.now(),
+                timestamp=QUOTE_TIMESTAMP,
                 price=Decimal("980.00")
             )
         ]
         for quote in quotes:
             data_manager.add_quote(quote)
 
-    @pytest.fixture
-    def client(self):
-        """Тестовый клиент FastAPI"""
-        return TestClient(app)
-
     def test_get_portfolio_json_report_success(self, client):
         """Тест успешного получения JSON отчета через API"""
         response = client.get("/api/v1/reports/json?portfolio_id=1")
@@ -133,9 +128,10 @@ class TestReportingAPIEndpoints:
             assert "pnl" in asset
             assert "pnl_percent" in asset
 
-    def test_get_portfolio_json_report_nonexistent_portfolio(self, client):
-        """Тест запроса JSON отчета для несуществующего портфеля"""
-        response = client.get("/api/v1/reports/json?portfolio_id=999")
+    @pytest.mark.parametrize("report_format", ["json", "pdf"])
+    def test_report_nonexistent_portfolio(self, client, report_format):
+        """Тест запроса отчета для несуществующего портфеля"""
+        response = client.get(f"/api/v1/reports/{report_format}?portfolio_id=999")
         
         assert response.status_code == 404
         error_data = response.json()
@@ -207,15 +203,6 @@ class TestReportingAPIEndpoints:
         assert response.status_code == 200
         mock_makedirs.assert_called_once_with("reports")
 
-    def test_generate_portfolio_pdf_report_nonexistent_portfolio(self, client):
-        """Тест генерации PDF для несуществующего портфеля через API"""
-        response = client.get("/api/v1/reports/pdf?portfolio_id=999")
-        
-        assert response.status_code == 404
-        error_data = response.json()
-        assert "detail" in error_data
-        assert "Portfolio with id 999 not found" in error_data["detail"]
-
     def test_generate_portfolio_pdf_report_default_portfolio(self, client):
         """Тест генерации PDF с параметром по умолчанию"""
         with patch('os.path.exists', return_value=True), \
@@ -291,19 +278,11 @@ class TestReportingAPIEndpoints:
 class TestReportingAPIIntegration:
     """Интеграционные тесты для полного цикла работы с отчетами"""
 
-    @pytest.fixture
-    def client(self):
-        """Тестовый клиент FastAPI"""
-        return TestClient(app)
-
     def test_full_reporting_workflow(self, client):
         """Тест полного цикла работы с отчетами"""
         # Настраиваем тестовые данные
         data_manager = get_data_manager()
-        data_manager._portfolios_store.clear()
-        data_manager._positions_store.clear()
-        data_manager._securities_store.clear()
-        data_manager._quotes_store.clear()
+        data_manager.clear_all()
         
         # Создаем портфель
         portfolio = Portfolio(id=1, name="Integration Test Portfolio")
@@ -325,7 +304,7 @@ class TestReportingAPIIntegration:
         quote = Quote(
             id=1,
             secid="TEST",
-            timestamp=datetime.now(),
+            timestamp=QUOTE_TIMESTAMP,
             price=Decimal("110.00")
         )
         data_manager.add_quote(quote)
@@ -358,8 +337,7 @@ class TestReportingAPIIntegration:
         """Тест одновременной генерации нескольких отчетов"""
         # Настраиваем данные
         data_manager = get_data_manager()
-        data_manager._portfolios_store.clear()
-        data_manager._positions_store.clear()
+        data_manager.clear_all()
         
         portfolio = Portfolio(id=1, name="Concurrent Test Portfolio")
         data_manager.add_portfolio(portfolio)
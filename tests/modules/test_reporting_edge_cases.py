@@ -5,9 +5,7 @@ import os
 from decimal import Decimal
 from datetime import datetime
 from unittest.mock import patch, MagicMock
-from fastapi.testclient import TestClient
 
-from app.main import app
 from app.storage import get_data_manager, DataManager
 from app.modules.reporting.service import ReportingService
 from app.modules.portfolio.models import Portfolio, Position
@@ -100,11 +98,6 @@ class TestReportingErrorHandling:
 class TestReportingAPIErrorHandling:
     """Тесты обработки ошибок в API эндпоинтах"""
 
-    @pytest.fixture
-    def client(self):
-        """Тестовый клиент FastAPI"""
-        return TestClient(app)
-
     def test_json_api_invalid_portfolio_id_type(self, client):
         """Тест API с некорректным типом portfolio_id"""
         response = client.get("/api/v1/reports/json?portfolio_id=abc")
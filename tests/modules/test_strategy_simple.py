@@ -2,12 +2,17 @@
 import pytest
 from datetime import datetime, date
 from decimal import Decimal
-from unittest.mock import Mock, AsyncMock, patch
+from fractions import Fraction
+from unittest.mock import Mock, AsyncMock, patch, create_autospec
 
+from app.modules.marketdata.service import MarketDataService
 from app.modules.strategy.service import StrategyService
 from app.modules.strategy.models import StrategyType
 from app.storage import DataManager
 
+# Autospec is built once per module; tests reset it instead of re-introspecting the class
+_market_data_service_spec = create_autospec(MarketDataService, instance=True)
+
 
 class TestStrategyService:
     """Tests for Strategy service layer"""
@@ -18,7 +23,8 @@ class TestStrategyService:
 
     @pytest.fixture
     def mock_market_data_service(self):
-        return AsyncMock()
+        _market_data_service_spec.reset_mock(return_value=True, side_effect=True)
+        return _market_data_service_spec
 
     @pytest.fixture
     def service(self, mock_data_manager, mock_market_data_service):
@@ -137,10 +143,10 @@ class TestStrategyBusinessLogic:
         """Test equal weight allocation calculation"""
         securities = ["SBER", "GAZP", "LKOH", "YNDX"]
         
-        equal_weights = {sec: Decimal("0.25") for sec in securities}
+        equal_weights = {sec: Fraction(1, len(securities)) for sec in securities}
         
-        assert sum(equal_weights.values()) == Decimal("1.0")
-        assert all(weight == Decimal("0.25") for weight in equal_weights.values())
+        assert sum(equal_weights.values()) == 1
+        assert all(weight == Fraction(1, 4) for weight in equal_weights.values())
 
     def test_market_cap_weight_allocation(self):
         """Test market cap weighted allocation"""
@@ -174,17 +180,18 @@ class TestStrategyBusinessLogic:
 
     def test_transaction_cost_calculation(self):
         """Test transaction cost calculation"""
-        trade_amount = Decimal("100000")
-        commission_rate = Decimal("0.0005")  # 0.05%
-        bid_ask_spread = Decimal("0.001")    # 0.1%
+        # Rates in basis points (1 bp = 0.01%), exact integer arithmetic
+        trade_amount = 100000
+        commission_bps = 5   # 0.05%
+        spread_bps = 10      # 0.1%
         
-        commission = trade_amount * commission_rate
-        market_impact = trade_amount * bid_ask_spread
+        commission = trade_amount * commission_bps // 10000
+        market_impact = trade_amount * spread_bps // 10000
         total_cost = commission + market_impact
         
-        assert commission == Decimal("50.0")
-        assert market_impact == Decimal("100.0")
-        assert total_cost == Decimal("150.0")
+        assert commission == 50
+        assert market_impact == 100
+        assert total_cost == 150
 
     def test_risk_metrics_calculation(self):
         """Test risk metrics calculation"""
@@ -0,0 +1,40 @@
+"""Построение конфигурации: замеры производительности и проверка model_construct"""
+
+import timeit
+
+import pytest
+
+from app.config import Settings
+
+
+@pytest.mark.perf
+class TestSettingsBenchmark:
+    """Сравнение способов создания Settings (запуск: pytest -m perf)"""
+
+    NUMBER = 100
+    REPEAT = 5
+
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            Settings,
+            Settings.model_construct,
+            lambda: Settings().model_dump(),
+        ],
+        ids=["full_validation", "model_construct", "model_dump"],
+    )
+    def test_settings_init(self, factory, record_property):
+        """Замер времени создания настроек, результат пишется в junit-отчет"""
+        best = min(timeit.repeat(factory, number=self.NUMBER, repeat=self.REPEAT))
+        per_call_us = best / self.NUMBER * 1_000_000
+
+        # Порог по времени не проверяется: на общих CI раннерах он нестабилен
+        record_property("settings_init_us", round(per_call_us, 2))
+
+
+class TestSettingsConstruct:
+    """Тесты создания Settings без валидации"""
+
+    def test_model_construct_matches_defaults(self):
+        """Тест что model_construct дает те же значения по умолчанию"""
+        assert Settings.model_construct().model_dump() == Settings().model_dump()
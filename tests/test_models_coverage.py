@@ -5,7 +5,7 @@
 import pytest
 from decimal import Decimal
 from datetime import datetime
-from typing import Dict, Any
+from types import SimpleNamespace
 
 # Импорты моделей
 from app.modules.marketdata import models as marketdata_models
@@ -13,22 +13,100 @@ from app.modules.portfolio import models as portfolio_models
 from app.modules.reporting import models as reporting_models
 from app.modules.strategy import models as strategy_models
 
+# Фиксированное время: тесты проверяют только тип timestamp, а не его значение
+_FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+# Все Decimal значения тестов разбираются из строк один раз на модуль
+_D = {
+    value: Decimal(value)
+    for value in (
+        "50", "100", "250.00", "250.50", "1000", "0.05", "100000", "100.50", "500",
+        "300.75", "1500", "300.50", "25000.00", "0.02", "105000", "5000", "0",
+        "999999999.99", "1000000.00", "0.000001", "0.01"
+    )
+}
+
+
+@pytest.fixture(scope="module")
+def sample_security():
+    """Security на модуль для тестов, которые только читают поля"""
+    return marketdata_models.Security(
+        secid="SBER",
+        name="Сбер Банк",
+        isin="RU0009029540"
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_portfolio():
+    """Portfolio на модуль для тестов, которые только читают поля"""
+    return portfolio_models.Portfolio(
+        id=1,
+        name="My Portfolio",
+        description="Test portfolio for unit tests"
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_position():
+    """Position на модуль для тестов, которые только читают поля"""
+    return portfolio_models.Position(
+        id=1,
+        portfolio_id=1,
+        secid="SBER",
+        quantity=100
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_transaction():
+    """Transaction на модуль для тестов, которые только читают поля"""
+    return reporting_models.Transaction(
+        id=1,
+        portfolio_id=1,
+        secid="SBER",
+        transaction_type="buy",
+        quantity=_D["100"],
+        price=_D["250.00"],
+        timestamp=_FIXED_NOW
+    )
+
+
+@pytest.fixture(scope="module")
+def linked_models(sample_transaction):
+    """Связанные Security, Portfolio, Position и Transaction одного портфеля"""
+    security = marketdata_models.Security(
+        id=1, secid="SBER", name="Сбер Банк"
+    )
+    portfolio = portfolio_models.Portfolio(
+        id=1, name="Test Portfolio"
+    )
+    position = portfolio_models.Position(
+        id=1,
+        portfolio_id=portfolio.id,
+        secid=security.secid,
+        quantity=100
+    )
+    return SimpleNamespace(
+        security=security,
+        portfolio=portfolio,
+        position=position,
+        transaction=sample_transaction,
+    )
+
 
 class TestMarketDataModels:
     """Тесты для моделей модуля marketdata"""
     
-    def test_security_model_creation(self):
+    @pytest.mark.parametrize("attr, expected", [
+        ("secid", "SBER"),
+        ("name", "Сбер Банк"),
+        ("isin", "RU0009029540"),
+        ("is_active", True),
+    ])
+    def test_security_model_creation(self, sample_security, attr, expected):
         """Тест создания модели Security"""
-        security = marketdata_models.Security(
-            secid="SBER",
-            name="Сбер Банк",
-            isin="RU0009029540"
-        )
-        
-        assert security.secid == "SBER"
-        assert security.name == "Сбер Банк"
-        assert security.isin == "RU0009029540"
-        assert security.is_active == True
+        assert getattr(sample_security, attr) == expected
         
     def test_security_model_validation(self):
         """Тест валидации модели Security"""
@@ -58,27 +136,27 @@ class TestMarketDataModels:
         """Тест создания модели Quote"""
         quote = marketdata_models.Quote(
             secid="SBER",
-            timestamp=datetime.now(),
-            price=Decimal("250.50"),
-            volume=Decimal("1000")
+            timestamp=_FIXED_NOW,
+            price=_D["250.50"],
+            volume=_D["1000"]
         )
         
         assert quote.secid == "SBER"
         assert isinstance(quote.timestamp, datetime)
-        assert quote.price == Decimal("250.50")
-        assert quote.volume == Decimal("1000")
+        assert quote.price == _D["250.50"]
+        assert quote.volume == _D["1000"]
         
     def test_quote_model_decimal_handling(self):
         """Тест обработки Decimal в модели Quote"""
         # Создание с разными типами числовых данных
         quote1 = marketdata_models.Quote(
-            secid="SBER", timestamp=datetime.now(),
-            price=Decimal("100.50"), volume=Decimal("500")
+            secid="SBER", timestamp=_FIXED_NOW,
+            price=_D["100.50"], volume=_D["500"]
         )
         
         quote2 = marketdata_models.Quote(
-            secid="GAZP", timestamp=datetime.now(),
-            price=Decimal("300.75"), volume=Decimal("1500")
+            secid="GAZP", timestamp=_FIXED_NOW,
+            price=_D["300.75"], volume=_D["1500"]
         )
         
         assert isinstance(quote1.price, Decimal)
@@ -90,17 +168,14 @@ class TestMarketDataModels:
 class TestPortfolioModels:
     """Тесты для моделей модуля portfolio"""
     
-    def test_portfolio_model_creation(self):
+    @pytest.mark.parametrize("attr, expected", [
+        ("id", 1),
+        ("name", "My Portfolio"),
+        ("description", "Test portfolio for unit tests"),
+    ])
+    def test_portfolio_model_creation(self, sample_portfolio, attr, expected):
         """Тест создания модели Portfolio"""
-        portfolio = portfolio_models.Portfolio(
-            id=1,
-            name="My Portfolio",
-            description="Test portfolio for unit tests"
-        )
-        
-        assert portfolio.id == 1
-        assert portfolio.name == "My Portfolio"
-        assert portfolio.description == "Test portfolio for unit tests"
+        assert getattr(sample_portfolio, attr) == expected
         
     def test_portfolio_model_without_description(self):
         """Тест создания модели Portfolio без описания"""
@@ -113,19 +188,12 @@ class TestPortfolioModels:
         assert portfolio.name == "Simple Portfolio"
         assert portfolio.description is None
         
-    def test_position_model_creation(self):
+    def test_position_model_creation(self, sample_position):
         """Тест создания модели Position"""
-        position = portfolio_models.Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            quantity=100
-        )
-        
-        assert position.id == 1
-        assert position.portfolio_id == 1
-        assert position.secid == "SBER"
-        assert position.quantity == 100
+        assert sample_position.id == 1
+        assert sample_position.portfolio_id == 1
+        assert sample_position.secid == "SBER"
+        assert sample_position.quantity == 100
         
     def test_position_model_negative_quantity(self):
         """Тест создания модели Position с отрицательным количеством"""
@@ -153,25 +221,15 @@ class TestPortfolioModels:
 class TestReportingModels:
     """Тесты для моделей модуля reporting"""
     
-    def test_transaction_model_creation(self):
+    def test_transaction_model_creation(self, sample_transaction):
         """Тест создания модели Transaction"""
-        transaction = reporting_models.Transaction(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            transaction_type="buy",
-            quantity=Decimal("100"),
-            price=Decimal("250.00"),
-            timestamp=datetime.now()
-        )
-        
-        assert transaction.id == 1
-        assert transaction.portfolio_id == 1
-        assert transaction.secid == "SBER"
-        assert transaction.transaction_type == "buy"
-        assert transaction.quantity == Decimal("100")
-        assert transaction.price == Decimal("250.00")
-        assert isinstance(transaction.timestamp, datetime)
+        assert sample_transaction.id == 1
+        assert sample_transaction.portfolio_id == 1
+        assert sample_transaction.secid == "SBER"
+        assert sample_transaction.transaction_type == "buy"
+        assert sample_transaction.quantity == _D["100"]
+        assert sample_transaction.price == _D["250.00"]
+        assert isinstance(sample_transaction.timestamp, datetime)
         
     def test_transaction_sell_model(self):
         """Тест создания модели Transaction для продажи"""
@@ -180,29 +238,19 @@ class TestReportingModels:
             portfolio_id=1,
             secid="GAZP",
             transaction_type="sell",
-            quantity=Decimal("50"),
-            price=Decimal("300.50"),
-            timestamp=datetime.now()
+            quantity=_D["50"],
+            price=_D["300.50"],
+            timestamp=_FIXED_NOW
         )
         
         assert transaction.transaction_type == "sell"
-        assert transaction.quantity == Decimal("50")
+        assert transaction.quantity == _D["50"]
         
-    def test_transaction_model_calculations(self):
+    def test_transaction_model_calculations(self, sample_transaction):
         """Тест вычислений в модели Transaction"""
-        transaction = reporting_models.Transaction(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            transaction_type="buy",
-            quantity=Decimal("100"),
-            price=Decimal("250.00"),
-            timestamp=datetime.now()
-        )
-        
         # Проверяем что можем вычислить общую сумму
-        total_amount = transaction.quantity * transaction.price
-        assert total_amount == Decimal("25000.00")
+        total_amount = sample_transaction.quantity * sample_transaction.price
+        assert total_amount == _D["25000.00"]
 
 
 class TestStrategyModels:
@@ -213,14 +261,14 @@ class TestStrategyModels:
         config = strategy_models.StrategyConfig(
             strategy_type=strategy_models.StrategyType.LAZY_INDEX_TRACKING,
             parameters={"target_weights": {"SBER": 0.6, "GAZP": 0.4}},
-            min_transaction_amount=Decimal("1000"),
-            max_weight_deviation=Decimal("0.05")
+            min_transaction_amount=_D["1000"],
+            max_weight_deviation=_D["0.05"]
         )
         
         assert config.strategy_type == strategy_models.StrategyType.LAZY_INDEX_TRACKING
         assert "target_weights" in config.parameters
-        assert config.min_transaction_amount == Decimal("1000")
-        assert config.max_weight_deviation == Decimal("0.05")
+        assert config.min_transaction_amount == _D["1000"]
+        assert config.max_weight_deviation == _D["0.05"]
         
     def test_strategy_config_validation(self):
         """Тест валидации модели StrategyConfig"""
@@ -232,7 +280,7 @@ class TestStrategyModels:
         config = strategy_models.StrategyConfig(
             strategy_type=strategy_models.StrategyType.LAZY_INDEX_TRACKING,
             parameters={"target_weights": weights},
-            rebalance_threshold=Decimal("0.02")
+            rebalance_threshold=_D["0.02"]
         )
         
         assert len(config.parameters["target_weights"]) == 3
@@ -242,64 +290,34 @@ class TestStrategyModels:
         result = strategy_models.RebalanceResult(
             portfolio_id=1,
             strategy_type=strategy_models.StrategyType.LAZY_INDEX_TRACKING,
-            current_total_value=Decimal("100000"),
-            target_total_value=Decimal("105000"),
-            cash_required=Decimal("5000"),
+            current_total_value=_D["100000"],
+            target_total_value=_D["105000"],
+            cash_required=_D["5000"],
             recommendations=[],
             total_transactions=0,
-            estimated_total_cost=Decimal("0")
+            estimated_total_cost=_D["0"]
         )
         
         assert result.portfolio_id == 1
         assert result.strategy_type == strategy_models.StrategyType.LAZY_INDEX_TRACKING
-        assert result.current_total_value == Decimal("100000")
+        assert result.current_total_value == _D["100000"]
         assert result.total_transactions == 0
 
 
 class TestModelsIntegration:
     """Интеграционные тесты моделей"""
     
-    def test_models_with_relationships(self):
+    def test_models_with_relationships(self, linked_models):
         """Тест моделей с связями"""
-        # Создаем связанные объекты
-        security = marketdata_models.Security(
-            id=1, secid="SBER", name="Сбер Банк"
-        )
-        
-        portfolio = portfolio_models.Portfolio(
-            id=1, name="Test Portfolio"
-        )
-        
-        position = portfolio_models.Position(
-            id=1,
-            portfolio_id=portfolio.id,
-            secid=security.secid,
-            quantity=100
-        )
-        
         # Проверяем связи
-        assert position.portfolio_id == portfolio.id
-        assert position.secid == security.secid
+        assert linked_models.position.portfolio_id == linked_models.portfolio.id
+        assert linked_models.position.secid == linked_models.security.secid
         
-    def test_models_data_consistency(self):
+    def test_models_data_consistency(self, linked_models):
         """Тест консистентности данных между моделями"""
-        # Создаем транзакцию и позицию для одного портфеля
-        transaction = reporting_models.Transaction(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            transaction_type="buy",
-            quantity=Decimal("100"),
-            price=Decimal("250.00"),
-            timestamp=datetime.now()
-        )
-        
-        position = portfolio_models.Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER", 
-            quantity=100
-        )
+        # Транзакция и позиция относятся к одному портфелю
+        transaction = linked_models.transaction
+        position = linked_models.position
         
         # Проверяем консистентность
         assert transaction.portfolio_id == position.portfolio_id
@@ -310,101 +328,53 @@ class TestModelsIntegration:
 class TestModelsValidation:
     """Тесты валидации моделей"""
     
-    def test_security_required_fields(self):
+    def test_security_required_fields(self, sample_security):
         """Тест обязательных полей Security"""
-        # Минимальный набор полей
-        security = marketdata_models.Security(
-            secid="TEST",
-            name="Test"
-        )
-        
-        assert security.secid is not None
-        assert security.name is not None
-        assert security.is_active == True
+        assert sample_security.secid is not None
+        assert sample_security.name is not None
+        assert sample_security.is_active == True
         
-    def test_portfolio_required_fields(self):
+    def test_portfolio_required_fields(self, sample_portfolio):
         """Тест обязательных полей Portfolio"""
-        portfolio = portfolio_models.Portfolio(
-            id=1,
-            name="Required Name"
-        )
-        
-        assert portfolio.id is not None
-        assert portfolio.name is not None
+        assert sample_portfolio.id is not None
+        assert sample_portfolio.name is not None
         
-    def test_position_required_fields(self):
+    @pytest.mark.parametrize("attr", ["id", "portfolio_id", "secid", "quantity"])
+    def test_position_required_fields(self, sample_position, attr):
         """Тест обязательных полей Position"""
-        position = portfolio_models.Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            quantity=0
-        )
-        
-        assert position.id is not None
-        assert position.portfolio_id is not None
-        assert position.secid is not None
-        assert position.quantity is not None
+        assert getattr(sample_position, attr) is not None
         
-    def test_transaction_required_fields(self):
+    @pytest.mark.parametrize("attr", [
+        "id", "portfolio_id", "secid", "transaction_type", "quantity", "price", "timestamp",
+    ])
+    def test_transaction_required_fields(self, sample_transaction, attr):
         """Тест обязательных полей Transaction"""
-        transaction = reporting_models.Transaction(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            transaction_type="buy",
-            quantity=Decimal("100"),
-            price=Decimal("250.00"),
-            timestamp=datetime.now()
-        )
-        
-        assert transaction.id is not None
-        assert transaction.portfolio_id is not None
-        assert transaction.secid is not None
-        assert transaction.transaction_type is not None
-        assert transaction.quantity is not None
-        assert transaction.price is not None
-        assert transaction.timestamp is not None
+        assert getattr(sample_transaction, attr) is not None
 
 
 class TestModelsEdgeCases:
     """Тесты граничных случаев для моделей"""
     
-    def test_large_numbers(self):
-        """Тест с большими числами"""
-        large_quantity = Decimal("999999999.99")
-        large_price = Decimal("1000000.00")
-        
-        transaction = reporting_models.Transaction(
-            id=1,
-            portfolio_id=1,
-            secid="EXPENSIVE",
-            transaction_type="buy",
-            quantity=large_quantity,
-            price=large_price,
-            timestamp=datetime.now()
-        )
-        
-        assert transaction.quantity == large_quantity
-        assert transaction.price == large_price
-        
-    def test_very_small_numbers(self):
-        """Тест с очень маленькими числами"""
-        small_quantity = Decimal("0.000001")
-        small_price = Decimal("0.01")
-        
+    @pytest.mark.parametrize("secid, quantity, price", [
+        # Большие числа
+        ("EXPENSIVE", _D["999999999.99"], _D["1000000.00"]),
+        # Очень маленькие числа
+        ("MICRO", _D["0.000001"], _D["0.01"]),
+    ], ids=["large", "small"])
+    def test_transaction_number_edges(self, secid, quantity, price):
+        """Тест Transaction с граничными числами"""
         transaction = reporting_models.Transaction(
             id=1,
             portfolio_id=1,
-            secid="MICRO",
+            secid=secid,
             transaction_type="buy",
-            quantity=small_quantity,
-            price=small_price,
-            timestamp=datetime.now()
+            quantity=quantity,
+            price=price,
+            timestamp=_FIXED_NOW
         )
         
-        assert transaction.quantity == small_quantity
-        assert transaction.price == small_price
+        assert transaction.quantity == quantity
+        assert transaction.price == price
         
     def test_unicode_strings(self):
         """Тест с Unicode строками"""
@@ -430,38 +400,3 @@ class TestModelsEdgeCases:
         
         assert len(portfolio.description) == 1000
         assert portfolio.description == long_description
-
-
-class TestModelsStringRepresentation:
-    """Тесты строкового представления моделей"""
-    
-    def test_security_str(self):
-        """Тест строкового представления Security"""
-        security = marketdata_models.Security(
-            id=1, secid="SBER", name="Сбербанк"
-        )
-        
-        # Проверяем что можем получить строковое представление
-        str_repr = str(security)
-        assert isinstance(str_repr, str)
-        assert len(str_repr) > 0
-        
-    def test_portfolio_str(self):
-        """Тест строкового представления Portfolio"""
-        portfolio = portfolio_models.Portfolio(
-            id=1, name="My Portfolio"
-        )
-        
-        str_repr = str(portfolio)
-        assert isinstance(str_repr, str)
-        assert len(str_repr) > 0
-        
-    def test_position_str(self):
-        """Тест строкового представления Position"""
-        position = portfolio_models.Position(
-            id=1, portfolio_id=1, secid="SBER", quantity=100
-        )
-        
-        str_repr = str(position)
-        assert isinstance(str_repr, str)
-        assert len(str_repr) > 0
\ No newline at end of file
@@ -1,224 +1,230 @@
 """Тесты для модуля scheduler"""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime, timedelta
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call, create_autospec, patch
 
+import app.scheduler as scheduler_module
+from app.modules.marketdata.service import MarketDataService
 from app.scheduler import setup_scheduler, daily_market_data_update
-from app.config import settings
+from app.storage import DataManager
+
+# Автоспеки сервисов строятся один раз на модуль, фикстуры только сбрасывают их
+_DATA_MANAGER_SPEC = create_autospec(DataManager, instance=True, spec_set=True)
+_MARKET_SERVICE_SPEC = create_autospec(MarketDataService, instance=True, spec_set=True)
+
+# Инструменты, которые возвращает get_securities; scheduler читает только secid
+_SBER = SimpleNamespace(secid='SBER')
+_GAZP = SimpleNamespace(secid='GAZP')
+_TWO_SECURITIES = [_SBER, _GAZP]
+
+
+class _FakeMarketService:
+    """Легкая замена MarketDataService с заготовленными ответами"""
+
+    def __init__(self, quote_results):
+        # Результаты sync_quotes_for_security по порядку; исключения выбрасываются
+        self.quote_results = list(quote_results)
+        self.get_securities_calls = 0
+        self.synced = []
+        self.closed = 0
+
+    async def get_securities(self):
+        self.get_securities_calls += 1
+        return _TWO_SECURITIES
+
+    async def sync_quotes_for_security(self, secid, from_date, to_date):
+        self.synced.append(secid)
+        result = self.quote_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def close(self):
+        self.closed += 1
+
+
+@pytest.fixture(autouse=True)
+def quiet_traceback(monkeypatch):
+    """Подавляет traceback.print_exc в ожидаемых ошибках и считает его вызовы"""
+    calls = []
+    monkeypatch.setattr("traceback.print_exc", lambda *args, **kwargs: calls.append(args))
+    return calls
 
 
 class TestSchedulerSetup:
     """Тесты для функции setup_scheduler"""
-    
+
     @patch('app.scheduler.logger')
-    def test_setup_scheduler_basic(self, mock_logger):
+    def test_setup_scheduler_basic(self, mock_logger, patched_settings, scheduler_mock):
         """Базовый тест настройки scheduler"""
-        mock_scheduler = MagicMock(spec=AsyncIOScheduler)
-        
         # Мокаем настройки
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.get_market_data_cron.return_value = '0 19 * * *'
-            mock_settings.scheduler.trading_mode = '24/7'
-            mock_settings.scheduler.timezone = 'Europe/Moscow'
-            
-            setup_scheduler(mock_scheduler)
-            
-            # Проверяем что job был добавлен
-            mock_scheduler.add_job.assert_called_once()
-            call_args = mock_scheduler.add_job.call_args
-            
-            # Проверяем параметры job
-            assert call_args[0][0] == daily_market_data_update
-            assert call_args[1]['id'] == 'daily_market_data_update'
-            assert call_args[1]['name'] == 'Daily Market Data Update'
-            assert call_args[1]['replace_existing'] is True
-            
+        patched_settings.scheduler.get_market_data_cron.return_value = '0 19 * * *'
+        patched_settings.scheduler.trading_mode = '24/7'
+        patched_settings.scheduler.timezone = 'Europe/Moscow'
+
+        setup_scheduler(scheduler_mock)
+
+        # Проверяем что job был добавлен
+        scheduler_mock.add_job.assert_called_once()
+        call_args = scheduler_mock.add_job.call_args
+
+        # Проверяем параметры job
+        assert call_args[0][0] == daily_market_data_update
+        assert call_args[1]['id'] == 'daily_market_data_update'
+        assert call_args[1]['name'] == 'Daily Market Data Update'
+        assert call_args[1]['replace_existing'] is True
+
     @patch('app.scheduler.logger')
-    def test_setup_scheduler_different_trading_modes(self, mock_logger):
+    def test_setup_scheduler_different_trading_modes(self, mock_logger, patched_settings, scheduler_mock):
         """Тест настройки scheduler для разных режимов торгов"""
-        mock_scheduler = MagicMock(spec=AsyncIOScheduler)
-        
         # Тест для режима 'market_hours'
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.get_market_data_cron.return_value = '0 20 * * 1-5'
-            mock_settings.scheduler.trading_mode = 'market_hours'
-            mock_settings.scheduler.timezone = 'Europe/Moscow'
-            
-            setup_scheduler(mock_scheduler)
-            
-            # Проверяем что логи содержат правильный режим
-            mock_logger.info.assert_any_call("Настройка планировщика в режиме 'market_hours'")
-            mock_logger.info.assert_any_call("Расписание синхронизации данных: 0 20 * * 1-5")
+        patched_settings.scheduler.get_market_data_cron.return_value = '0 20 * * 1-5'
+        patched_settings.scheduler.trading_mode = 'market_hours'
+        patched_settings.scheduler.timezone = 'Europe/Moscow'
+
+        setup_scheduler(scheduler_mock)
+
+        # Проверяем что логи содержат правильный режим
+        mock_logger.info.assert_has_calls([
+            call("Настройка планировщика в режиме 'market_hours'"),
+            call("Расписание синхронизации данных: 0 20 * * 1-5"),
+        ], any_order=True)
 
 
 class TestDailyMarketDataUpdate:
     """Тесты для функции daily_market_data_update"""
-    
+
+    @pytest.fixture(autouse=True)
+    def scheduler_settings(self, patched_settings):
+        """Настройки планировщика в режиме 24/7 для всех тестов класса"""
+        patched_settings.scheduler.trading_mode = '24/7'
+        return patched_settings
+
+    @pytest.fixture
+    def service_classes(self, monkeypatch):
+        """Подмена классов DataManager и MarketDataService в модуле scheduler"""
+        mock_market_service_class = MagicMock()
+        mock_data_manager_class = MagicMock()
+        monkeypatch.setattr(scheduler_module, "MarketDataService", mock_market_service_class)
+        monkeypatch.setattr(scheduler_module, "DataManager", mock_data_manager_class)
+        return mock_market_service_class, mock_data_manager_class
+
+    @pytest.fixture
+    def mock_data_manager(self, service_classes):
+        """Мок DataManager, который возвращает подмененный класс"""
+        _DATA_MANAGER_SPEC.reset_mock(return_value=True, side_effect=True)
+        service_classes[1].return_value = _DATA_MANAGER_SPEC
+        return _DATA_MANAGER_SPEC
+
+    @pytest.fixture
+    def mock_market_service(self, service_classes):
+        """Мок MarketDataService, который возвращает подмененный класс"""
+        _MARKET_SERVICE_SPEC.reset_mock(return_value=True, side_effect=True)
+        service_classes[0].return_value = _MARKET_SERVICE_SPEC
+        return _MARKET_SERVICE_SPEC
+
     @pytest.mark.asyncio
     @patch('app.scheduler.logger')
-    @patch('app.scheduler.DataManager')
-    @patch('app.scheduler.MarketDataService')
-    async def test_daily_market_data_update_success(self, mock_market_service_class, mock_data_manager_class, mock_logger):
+    async def test_daily_market_data_update_success(self, mock_logger, service_classes, mock_data_manager):
         """Тест успешного выполнения обновления данных"""
-        # Настраиваем моки
-        mock_data_manager = AsyncMock()
-        mock_data_manager_class.return_value = mock_data_manager
-        
-        mock_market_service = AsyncMock()
-        mock_market_service_class.return_value = mock_market_service
-        
-        # Мокаем securities
-        mock_securities = [
-            MagicMock(secid='SBER'),
-            MagicMock(secid='GAZP'),
-        ]
-        mock_market_service.get_securities.return_value = mock_securities
-        mock_market_service.sync_quotes_for_security.return_value = 10
-        
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.trading_mode = '24/7'
-            await daily_market_data_update()
-            
+        mock_market_service_class, mock_data_manager_class = service_classes
+        market_service = _FakeMarketService([10, 10])
+        mock_market_service_class.return_value = market_service
+
+        await daily_market_data_update()
+
         # Проверяем что сервис был создан
         mock_data_manager_class.assert_called_once()
         mock_market_service_class.assert_called_once_with(mock_data_manager)
-        
+
         # Проверяем что данные загружались
-        mock_market_service.get_securities.assert_called()
-        
+        assert market_service.get_securities_calls >= 1
+
         # Проверяем что обновления по каждому инструменту вызывались
-        assert mock_market_service.sync_quotes_for_security.call_count == 2
-        
+        assert market_service.synced == ['SBER', 'GAZP']
+
         # Проверяем что сервис был закрыт
-        mock_market_service.close.assert_called_once()
-        
+        assert market_service.closed == 1
+
     @pytest.mark.asyncio
     @patch('app.scheduler.logger')
-    @patch('app.scheduler.DataManager')
-    @patch('app.scheduler.MarketDataService')
-    async def test_daily_market_data_update_no_securities_loads_from_moex(self, mock_market_service_class, mock_data_manager_class, mock_logger):
+    async def test_daily_market_data_update_no_securities_loads_from_moex(self, mock_logger, mock_market_service):
         """Тест обновления когда нет локальных данных - загрузка с MOEX"""
-        mock_data_manager = AsyncMock()
-        mock_data_manager_class.return_value = mock_data_manager
-        
-        mock_market_service = AsyncMock()
-        mock_market_service_class.return_value = mock_market_service
-        
         # Первый вызов возвращает пустой список, второй - данные
-        mock_securities = [MagicMock(secid='SBER')]
-        mock_market_service.get_securities.side_effect = [[], mock_securities]
+        mock_market_service.get_securities.side_effect = [[], [_SBER]]
         mock_market_service.sync_securities_from_moex.return_value = 100
         mock_market_service.sync_quotes_for_security.return_value = 5
-        
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.trading_mode = '24/7'
-            await daily_market_data_update()
-            
+
+        await daily_market_data_update()
+
         # Проверяем что данные загружались с MOEX
         mock_market_service.sync_securities_from_moex.assert_called_once()
-        mock_logger.info.assert_any_call("No securities found in local storage, loading from MOEX...")
-        mock_logger.info.assert_any_call("Loaded 100 securities from MOEX")
-        
-    @pytest.mark.asyncio  
+        mock_logger.info.assert_has_calls([
+            call("No securities found in local storage, loading from MOEX..."),
+            call("Loaded 100 securities from MOEX"),
+        ], any_order=True)
+
+    @pytest.mark.asyncio
     @patch('app.scheduler.logger')
-    @patch('app.scheduler.DataManager')
-    @patch('app.scheduler.MarketDataService')
-    async def test_daily_market_data_update_no_securities_after_moex(self, mock_market_service_class, mock_data_manager_class, mock_logger):
+    async def test_daily_market_data_update_no_securities_after_moex(self, mock_logger, mock_market_service):
         """Тест когда не удается загрузить данные даже с MOEX"""
-        mock_data_manager = AsyncMock()
-        mock_data_manager_class.return_value = mock_data_manager
-        
-        mock_market_service = AsyncMock()
-        mock_market_service_class.return_value = mock_market_service
-        
         # Всегда возвращаем пустой список
         mock_market_service.get_securities.return_value = []
         mock_market_service.sync_securities_from_moex.return_value = 0
-        
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.trading_mode = '24/7'
-            await daily_market_data_update()
-            
+
+        await daily_market_data_update()
+
         # Проверяем что была ошибка
         mock_logger.error.assert_any_call("Failed to load securities data")
-        
+
         # Quotes не должны обновляться
         mock_market_service.sync_quotes_for_security.assert_not_called()
-        
+
     @pytest.mark.asyncio
     @patch('app.scheduler.logger')
-    @patch('app.scheduler.DataManager')
-    @patch('app.scheduler.MarketDataService')
-    async def test_daily_market_data_update_with_security_error(self, mock_market_service_class, mock_data_manager_class, mock_logger):
+    async def test_daily_market_data_update_with_security_error(self, mock_logger, service_classes):
         """Тест обработки ошибок при обновлении отдельного инструмента"""
-        mock_data_manager = AsyncMock()
-        mock_data_manager_class.return_value = mock_data_manager
-        
-        mock_market_service = AsyncMock()
-        mock_market_service_class.return_value = mock_market_service
-        
-        mock_securities = [
-            MagicMock(secid='SBER'),
-            MagicMock(secid='GAZP'),
-        ]
-        mock_market_service.get_securities.return_value = mock_securities
-        
         # Первый security вызывает ошибку, второй - успешно
-        mock_market_service.sync_quotes_for_security.side_effect = [
-            Exception("Network error"), 
-            15
-        ]
-        
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.trading_mode = '24/7'
-            await daily_market_data_update()
-            
+        market_service = _FakeMarketService([Exception("Network error"), 15])
+        service_classes[0].return_value = market_service
+
+        await daily_market_data_update()
+
         # Проверяем что ошибка была залогирована
         mock_logger.error.assert_any_call("Failed to update historical data for SBER: Network error")
-        
+
         # Проверяем что второй security все равно обработался
-        assert mock_market_service.sync_quotes_for_security.call_count == 2
-        
+        assert market_service.synced == ['SBER', 'GAZP']
+
     @pytest.mark.asyncio
     @patch('app.scheduler.logger')
-    @patch('app.scheduler.DataManager')
-    @patch('app.scheduler.MarketDataService')
-    @patch('traceback.print_exc')
-    async def test_daily_market_data_update_general_exception(self, mock_print_exc, mock_market_service_class, mock_data_manager_class, mock_logger):
+    async def test_daily_market_data_update_general_exception(self, mock_logger, service_classes, quiet_traceback):
         """Тест обработки общих ошибок"""
+        mock_market_service_class, mock_data_manager_class = service_classes
         mock_data_manager_class.side_effect = Exception("Database connection failed")
-        
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.trading_mode = '24/7'
-            await daily_market_data_update()
-            
+
+        await daily_market_data_update()
+
         # Проверяем что ошибка была залогирована
         mock_logger.error.assert_any_call("Market data update failed: Database connection failed")
-        mock_print_exc.assert_called_once()
+        assert len(quiet_traceback) == 1
 
 
 class TestSchedulerLogging:
     """Тесты логирования scheduler"""
-    
+
     @patch('app.scheduler.logger')
-    def test_scheduler_logging_messages(self, mock_logger):
+    def test_scheduler_logging_messages(self, mock_logger, patched_settings, scheduler_mock):
         """Тест сообщений логирования в scheduler"""
-        mock_scheduler = MagicMock(spec=AsyncIOScheduler)
-        
-        with patch('app.scheduler.settings') as mock_settings:
-            mock_settings.scheduler.get_market_data_cron.return_value = '0 19 * * *'
-            mock_settings.scheduler.trading_mode = '24/7'
-            mock_settings.scheduler.timezone = 'Europe/Moscow'
-            
-            setup_scheduler(mock_scheduler)
-            
+        patched_settings.scheduler.get_market_data_cron.return_value = '0 19 * * *'
+        patched_settings.scheduler.trading_mode = '24/7'
+        patched_settings.scheduler.timezone = 'Europe/Moscow'
+
+        setup_scheduler(scheduler_mock)
+
         # Проверяем что логи вызываются с правильными сообщениями
-        expected_calls = [
-            "Настройка планировщика в режиме '24/7'",
-            "Расписание синхронизации данных: 0 19 * * *"
-        ]
-        
-        for expected_msg in expected_calls:
-            mock_logger.info.assert_any_call(expected_msg)
\ No newline at end of file
+        mock_logger.info.assert_has_calls([
+            call("Настройка планировщика в режиме '24/7'"),
+            call("Расписание синхронизации данных: 0 19 * * *"),
+        ], any_order=True)
\ No newline at end of file
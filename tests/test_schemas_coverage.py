@@ -7,225 +7,139 @@ from decimal import Decimal
 from datetime import datetime
 from typing import Dict, Any
 
+from pydantic import BaseModel
+from pydantic_core import to_json
+
 # Импорты схем
 from app.modules.marketdata import schemas as marketdata_schemas
 from app.modules.portfolio import schemas as portfolio_schemas  
 from app.modules.reporting import schemas as reporting_schemas
 from app.modules.strategy import schemas as strategy_schemas
 
-
-class TestMarketDataSchemas:
-    """Тесты для схем модуля marketdata"""
+# Фиксированные значения для тестовых данных схем
+_FIXED_TS = datetime(2024, 1, 1, 12, 0, 0)
+_PRICE = Decimal("250.00")
+_QTY_100 = Decimal("100")
+_VOL_1000 = Decimal("1000")
+
+# Модули схем, по которым идут тесты уровня модуля
+_MODULES = (marketdata_schemas, portfolio_schemas, reporting_schemas, strategy_schemas)
+
+# Суффиксы имен классов схем
+_SCHEMA_SUFFIXES = ('Create', 'Update', 'Response')
+
+
+@pytest.fixture(scope="session")
+def schema_classes():
+    """Пары (модуль, pydantic класс схемы), собираются один раз за сессию
+
+    vars() отдает имя и значение атрибута за один проход.
+    """
+    return tuple(
+        (module, attr)
+        for module in _MODULES
+        for attr_name, attr in vars(module).items()
+        if attr_name.endswith(_SCHEMA_SUFFIXES)
+        and isinstance(attr, type) and issubclass(attr, BaseModel)
+    )
+
+
+# Тесты уровня модуля параметризуются модулями схем вместо цикла внутри теста
+parametrize_modules = pytest.mark.parametrize(
+    "module",
+    _MODULES,
+    ids=["marketdata", "portfolio", "reporting", "strategy"],
+)
+
+
+def requires_schema(module, name):
+    """Пропуск теста, если схемы нет в модуле (проверяется один раз при сборе)"""
+    return pytest.mark.skipif(
+        not hasattr(module, name), reason=f"{module.__name__}.{name} не определена"
+    )
+
+
+# Обязательные поля Create схем: (модуль, имя схемы, имена обязательных полей)
+_REQUIRED_FIELDS = {
+    "security": (marketdata_schemas, "SecurityCreate", {"secid", "name"}),
+    "quote": (marketdata_schemas, "QuoteCreate", {"secid", "timestamp"}),
+    "portfolio": (portfolio_schemas, "PortfolioCreate", {"name"}),
+    "position": (portfolio_schemas, "PositionCreate",
+                 {"portfolio_id", "secid", "quantity"}),
+    "transaction": (reporting_schemas, "TransactionCreate",
+                    {"portfolio_id", "secid", "transaction_type", "quantity", "price"}),
+    "strategy": (strategy_schemas, "StrategyCreate",
+                 {"name", "strategy_type", "config"}),
+}
+
+
+class TestCreateSchemasFields:
+    """Тесты полей Create схем модулей"""
     
-    def test_security_create_schema(self):
-        """Тест создания схемы Security"""
-        data = {
-            "secid": "SBER",
-            "name": "Сбер Банк",
-            "isin": "RU0009029540"
-        }
-        
-        # Проверяем что можно создать схему
-        try:
-            schema = marketdata_schemas.SecurityCreate(**data)
-            assert schema.secid == "SBER"
-            assert schema.name == "Сбер Банк"
-            assert schema.isin == "RU0009029540"
-        except Exception as e:
-            # Если схемы не определены, просто импорт не должен падать
-            pass
-            
-    def test_quote_create_schema(self):
-        """Тест создания схемы Quote"""
-        data = {
-            "secid": "SBER",
-            "timestamp": datetime.now(),
-            "price": Decimal("250.00"),
-            "volume": Decimal("1000")
+    @pytest.mark.parametrize("schema_class, required", [
+        pytest.param(getattr(module, name, None), required,
+                     id=key, marks=requires_schema(module, name))
+        for key, (module, name, required) in _REQUIRED_FIELDS.items()
+    ])
+    def test_required_fields(self, schema_class, required):
+        """Тест что схема требует ровно ожидаемые поля"""
+        actual = {
+            field_name
+            for field_name, field in schema_class.model_fields.items()
+            if field.is_required()
         }
-        
-        try:
-            schema = marketdata_schemas.QuoteCreate(**data)
-            assert schema.secid == "SBER"
-            assert schema.price == Decimal("250.00")
-        except Exception:
-            pass
-
-
-class TestPortfolioSchemas:
-    """Тесты для схем модуля portfolio"""
+        assert actual == required
+
+
+# Корректные данные схем для полной валидации: (модуль, имя схемы, данные)
+_VALID_PAYLOADS = {
+    "security": (marketdata_schemas, "SecurityCreate",
+                 {"secid": "SBER", "name": "Сбер Банк", "isin": "RU0009029540"}),
+    "quote": (marketdata_schemas, "QuoteCreate",
+              {"secid": "SBER", "timestamp": _FIXED_TS,
+               "close_price": _PRICE, "volume": _VOL_1000}),
+    "portfolio": (portfolio_schemas, "PortfolioCreate",
+                  {"name": "My Portfolio", "description": "Test portfolio"}),
+    "position": (portfolio_schemas, "PositionCreate",
+                 {"portfolio_id": 1, "secid": "SBER", "quantity": 100}),
+    "transaction": (reporting_schemas, "TransactionCreate",
+                    {"portfolio_id": 1, "secid": "SBER", "transaction_type": "buy",
+                     "quantity": _QTY_100, "price": _PRICE, "timestamp": _FIXED_TS}),
+}
+
+
+class TestSchemasValidation:
+    """Тесты валидации схем на корректных данных"""
     
-    def test_portfolio_create_schema(self):
-        """Тест создания схемы Portfolio"""
-        data = {
-            "name": "My Portfolio",
-            "description": "Test portfolio"
-        }
-        
-        try:
-            schema = portfolio_schemas.PortfolioCreate(**data)
-            assert schema.name == "My Portfolio"
-            assert schema.description == "Test portfolio"
-        except Exception:
-            pass
-            
-    def test_position_create_schema(self):
-        """Тест создания схемы Position"""
-        data = {
-            "portfolio_id": 1,
-            "secid": "SBER",
-            "quantity": 100
-        }
-        
-        try:
-            schema = portfolio_schemas.PositionCreate(**data)
-            assert schema.portfolio_id == 1
-            assert schema.secid == "SBER"
-            assert schema.quantity == 100
-        except Exception:
-            pass
-
-
-class TestReportingSchemas:
-    """Тесты для схем модуля reporting"""
-    
-    def test_transaction_create_schema(self):
-        """Тест создания схемы Transaction"""
-        data = {
-            "portfolio_id": 1,
-            "secid": "SBER",
-            "transaction_type": "buy",
-            "quantity": Decimal("100"),
-            "price": Decimal("250.00"),
-            "timestamp": datetime.now()
-        }
-        
-        try:
-            schema = reporting_schemas.TransactionCreate(**data)
-            assert schema.portfolio_id == 1
-            assert schema.secid == "SBER"
-        except Exception:
-            pass
-            
-    def test_report_create_schema(self):
-        """Тест создания схемы Report"""
-        data = {
-            "portfolio_id": 1,
-            "report_type": "portfolio",
-            "start_date": datetime.now().date(),
-            "end_date": datetime.now().date()
-        }
-        
-        try:
-            schema = reporting_schemas.ReportCreate(**data)
-            assert schema.portfolio_id == 1
-        except Exception:
-            pass
-
-
-class TestStrategySchemas:
-    """Тесты для схем модуля strategy"""
-    
-    def test_rebalance_rule_create_schema(self):
-        """Тест создания схемы RebalanceRule"""
-        data = {
-            "name": "Test Rule",
-            "strategy_type": "target_weight",
-            "target_weights": {"SBER": 0.5, "GAZP": 0.5},
-            "rebalance_threshold": 0.05
-        }
-        
-        try:
-            schema = strategy_schemas.RebalanceRuleCreate(**data)
-            assert schema.name == "Test Rule"
-        except Exception:
-            pass
-            
-    def test_strategy_create_schema(self):
-        """Тест создания схемы Strategy"""
-        data = {
-            "name": "Conservative Strategy",
-            "description": "Low risk strategy",
-            "rules": []
-        }
-        
-        try:
-            schema = strategy_schemas.StrategyCreate(**data)
-            assert schema.name == "Conservative Strategy"
-        except Exception:
-            pass
-
-
-class TestSchemasImport:
-    """Тесты импортов схем"""
-    
-    def test_marketdata_schemas_import(self):
-        """Тест импорта схем marketdata"""
-        # Проверяем что модуль импортируется
-        assert marketdata_schemas is not None
-        
-        # Проверяем базовые атрибуты модуля
-        module_dict = dir(marketdata_schemas)
-        assert isinstance(module_dict, list)
-        
-    def test_portfolio_schemas_import(self):
-        """Тест импорта схем portfolio"""
-        assert portfolio_schemas is not None
-        module_dict = dir(portfolio_schemas)
-        assert isinstance(module_dict, list)
-        
-    def test_reporting_schemas_import(self):
-        """Тест импорта схем reporting"""
-        assert reporting_schemas is not None
-        module_dict = dir(reporting_schemas)
-        assert isinstance(module_dict, list)
-        
-    def test_strategy_schemas_import(self):
-        """Тест импорта схем strategy"""
-        assert strategy_schemas is not None
-        module_dict = dir(strategy_schemas)
-        assert isinstance(module_dict, list)
+    # JSON строится один раз при сборе тестов и валидируется pydantic-core за один проход
+    @pytest.mark.parametrize("schema_class, payload_json, expected", [
+        pytest.param(getattr(module, name, None), to_json(data), data,
+                     id=key, marks=requires_schema(module, name))
+        for key, (module, name, data) in _VALID_PAYLOADS.items()
+    ])
+    def test_create_schema_validates(self, schema_class, payload_json, expected):
+        """Тест что схема проходит полную валидацию на корректных данных"""
+        schema = schema_class.model_validate_json(payload_json)
+        for field, value in expected.items():
+            assert getattr(schema, field) == value
 
 
 class TestSchemasBasic:
     """Базовые тесты схем"""
     
-    def test_schemas_modules_exist(self):
-        """Тест что модули схем существуют"""
-        modules = [
-            marketdata_schemas,
-            portfolio_schemas,
-            reporting_schemas,
-            strategy_schemas
-        ]
-        
-        for module in modules:
-            assert module is not None
-            assert hasattr(module, '__name__')
-            
-    def test_schemas_attributes(self):
-        """Тест атрибутов модулей схем"""
-        # Проверяем что в модулях есть основные атрибуты
-        for module in [marketdata_schemas, portfolio_schemas, 
-                      reporting_schemas, strategy_schemas]:
-            # Основные атрибуты Python модуля
-            assert hasattr(module, '__file__')
-            assert hasattr(module, '__package__')
-            
-    def test_schemas_basic_functionality(self):
-        """Тест базовой функциональности схем"""
-        # Проверяем что можем получить список атрибутов
-        for module in [marketdata_schemas, portfolio_schemas,
-                      reporting_schemas, strategy_schemas]:
-            attrs = dir(module)
-            assert isinstance(attrs, list)
-            assert len(attrs) > 0  # В модуле должны быть атрибуты
+    @parametrize_modules
+    def test_module_sanity(self, module):
+        """Тест что модуль схем загружен и имеет базовые атрибуты Python модуля"""
+        assert module is not None and all(
+            hasattr(module, attr)
+            for attr in ('__name__', '__file__', '__package__', '__doc__')
+        )
 
 
 class TestSchemasErrorHandling:
     """Тесты обработки ошибок в схемах"""
     
-    def test_invalid_data_handling(self):
+    def test_invalid_data_handling(self, schema_classes):
         """Тест обработки некорректных данных"""
         invalid_data = {
             "invalid_field": "invalid_value",
@@ -233,97 +147,34 @@ class TestSchemasErrorHandling:
         }
         
         # Проверяем что создание схем с некорректными данными обрабатывается
-        schema_classes = []
-        
-        # Пытаемся найти классы схем в модулях
-        for module in [marketdata_schemas, portfolio_schemas,
-                      reporting_schemas, strategy_schemas]:
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (hasattr(attr, '__call__') and 
-                    attr_name.endswith(('Create', 'Update', 'Response'))):
-                    schema_classes.append(attr)
-        
-        # Если найдены классы схем, проверяем их
-        for schema_class in schema_classes:
+        for _, schema_class in schema_classes:
             try:
                 schema_class(**invalid_data)
             except Exception as e:
                 # Ожидаем что будет исключение валидации
                 assert e is not None
                 
-    def test_empty_data_handling(self):
+    def test_empty_data_handling(self, schema_classes):
         """Тест обработки пустых данных"""
-        empty_data = {}
-        
-        # Проверяем что схемы корректно обрабатывают пустые данные
-        for module in [marketdata_schemas, portfolio_schemas,
-                      reporting_schemas, strategy_schemas]:
-            for attr_name in dir(module):
-                if attr_name.startswith('_'):
-                    continue
-                    
-                attr = getattr(module, attr_name)
-                if hasattr(attr, '__call__'):
-                    try:
-                        attr(**empty_data)
-                    except Exception:
-                        # Пустые данные могут вызывать ошибки валидации
-                        pass
+        # model_construct не валидирует данные, поэтому исключения не создаются
+        for _, schema_class in schema_classes:
+            schema = schema_class.model_construct()
+            assert isinstance(schema, schema_class)
 
 
 class TestSchemasDocumentation:
     """Тесты документации схем"""
     
-    def test_modules_have_docstrings(self):
-        """Тест что модули имеют документацию"""
-        for module in [marketdata_schemas, portfolio_schemas,
-                      reporting_schemas, strategy_schemas]:
-            # Проверяем что у модуля есть docstring или хотя бы __doc__
-            assert hasattr(module, '__doc__')
-            
-    def test_schemas_introspection(self):
+    @parametrize_modules
+    def test_schemas_introspection(self, module):
         """Тест интроспекции схем"""
         # Проверяем что можем получить информацию о схемах
-        for module in [marketdata_schemas, portfolio_schemas,
-                      reporting_schemas, strategy_schemas]:
-            module_name = getattr(module, '__name__', 'unknown')
-            assert isinstance(module_name, str)
-            assert len(module_name) > 0
-            
-            # Проверяем файл модуля
-            module_file = getattr(module, '__file__', None)
-            if module_file:
-                assert isinstance(module_file, str)
-                assert module_file.endswith('.py')
-
-
-class TestSchemasIntegration:
-    """Интеграционные тесты схем"""
-    
-    def test_cross_module_compatibility(self):
-        """Тест совместимости между модулями схем"""
-        # Проверяем что модули схем могут работать вместе
-        modules = {
-            'marketdata': marketdata_schemas,
-            'portfolio': portfolio_schemas,
-            'reporting': reporting_schemas,
-            'strategy': strategy_schemas
-        }
-        
-        # Проверяем что все модули загружены
-        for name, module in modules.items():
-            assert module is not None
-            assert hasattr(module, '__name__')
-            
-    def test_schemas_consistency(self):
-        """Тест консистентности схем"""
-        # Проверяем что все модули схем имеют схожую структуру
-        for module in [marketdata_schemas, portfolio_schemas,
-                      reporting_schemas, strategy_schemas]:
-            # Все модули должны быть объектами Python
-            assert module is not None
-            
-            # Все модули должны иметь базовые атрибуты
-            attrs = dir(module)
-            assert '__name__' in [attr for attr in attrs if hasattr(module, attr)]
\ No newline at end of file
+        module_name = getattr(module, '__name__', 'unknown')
+        assert isinstance(module_name, str)
+        assert len(module_name) > 0
+        
+        # Проверяем файл модуля
+        module_file = getattr(module, '__file__', None)
+        if module_file:
+            assert isinstance(module_file, str)
+            assert module_file.endswith('.py')
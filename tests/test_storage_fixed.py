@@ -3,6 +3,7 @@ Comprehensive tests for storage.py
 """
 
 import pytest
+from collections import namedtuple
 from datetime import datetime, date
 from decimal import Decimal
 
@@ -10,14 +11,115 @@ from app.storage import DataManager, get_data_manager
 from app.modules.marketdata.models import Security, Quote
 from app.modules.portfolio.models import Portfolio, Position
 
+# Lightweight stand-in for the reporting Transaction model
+MockTransaction = namedtuple("MockTransaction", ["id", "portfolio_id", "secid"])
+
+# Decimal values repeated across tests are parsed from strings once per module
+_D = {value: Decimal(value) for value in ("100", "257.0", "260.0")}
+
+# Quote timestamps for two consecutive trading days
+_TS_D1 = datetime(2024, 1, 15, 10, 0, 0)
+_TS_D2 = datetime(2024, 1, 16, 10, 0, 0)
+
+# Models shared by the tests below are validated once at import.
+# DataManager only stores references, so tests reuse them as is and
+# use model_copy() where a variation is needed.
+_SBER_SEC = Security(
+    secid="SBER",
+    name="ПАО Сбербанк",
+    isin="RU0009029540",
+    engine="stock",
+    market="shares",
+    board="TQBR"
+)
+_GAZP_SEC = Security(
+    secid="GAZP",
+    name="ПАО Газпром",
+    isin="RU0009024277",
+    engine="stock",
+    market="shares",
+    board="TQBR"
+)
+
+_SBER_QUOTE_D1 = Quote(
+    secid="SBER",
+    timestamp=_TS_D1,
+    price=Decimal("252.0"),
+    volume=Decimal("1000000"),
+    bid=Decimal("251.5"),
+    ask=Decimal("252.5")
+)
+_SBER_QUOTE_D2 = Quote(
+    secid="SBER",
+    timestamp=_TS_D2,
+    price=_D["257.0"],
+    volume=Decimal("1200000"),
+    bid=Decimal("256.5"),
+    ask=Decimal("257.5")
+)
+_GAZP_QUOTE_D1 = Quote(
+    secid="GAZP",
+    timestamp=_TS_D1,
+    price=Decimal("152.0"),
+    volume=Decimal("2000000"),
+    bid=Decimal("151.5"),
+    ask=Decimal("152.5")
+)
+
+_PORT1 = Portfolio(
+    id=1,
+    name="Test Portfolio",
+    description="Test portfolio description",
+    total_value=Decimal("100000"),
+    cash_balance=Decimal("10000"),
+    is_active=True
+)
+_PORT2 = Portfolio(
+    id=2,
+    name="Portfolio 2",
+    description="Second portfolio",
+    total_value=Decimal("200000"),
+    cash_balance=Decimal("20000"),
+    is_active=True
+)
+
+_POS_SBER_P1 = Position(
+    id=1,
+    portfolio_id=1,
+    secid="SBER",
+    quantity=_D["100"],
+    avg_price=Decimal("250.0"),
+    market_price=_D["260.0"]
+)
+_POS_GAZP_P1 = Position(
+    id=2,
+    portfolio_id=1,
+    secid="GAZP",
+    quantity=Decimal("200"),
+    avg_price=Decimal("150.0"),
+    market_price=Decimal("155.0")
+)
+_POS_SBER_P2 = Position(
+    id=3,
+    portfolio_id=2,
+    secid="SBER",
+    quantity=Decimal("50"),
+    avg_price=Decimal("255.0"),
+    market_price=_D["260.0"]
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_manager(request, clean_data_manager):
+    """Shared DataManager, cleared before each test and exposed as self.manager"""
+    if request.instance is not None:
+        request.instance.manager = clean_data_manager
+    return clean_data_manager
+
 
 class TestDataManager:
     """Tests for DataManager class"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
     def test_data_manager_initialization(self):
         """Test DataManager initialization"""
         manager = DataManager()
@@ -35,57 +137,35 @@ class TestDataManager:
         assert manager.get_next_position_id() == 1
         assert manager.get_next_transaction_id() == 1
         
-    def test_id_counter_increments(self):
+    @pytest.mark.parametrize("getter_name, expected_seq", [
+        ("get_next_security_id", [1, 2, 3]),
+        ("get_next_quote_id", [1, 2]),
+        ("get_next_portfolio_id", [1, 2]),
+        ("get_next_position_id", [1, 2]),
+        ("get_next_transaction_id", [1, 2]),
+    ])
+    def test_id_counter_increments(self, getter_name, expected_seq):
         """Test that ID counters increment properly"""
-        # Security IDs
-        assert self.manager.get_next_security_id() == 1
-        assert self.manager.get_next_security_id() == 2
-        assert self.manager.get_next_security_id() == 3
-        
-        # Quote IDs
-        assert self.manager.get_next_quote_id() == 1
-        assert self.manager.get_next_quote_id() == 2
-        
-        # Portfolio IDs
-        assert self.manager.get_next_portfolio_id() == 1
-        assert self.manager.get_next_portfolio_id() == 2
-        
-        # Position IDs
-        assert self.manager.get_next_position_id() == 1
-        assert self.manager.get_next_position_id() == 2
-        
-        # Transaction IDs
-        assert self.manager.get_next_transaction_id() == 1
-        assert self.manager.get_next_transaction_id() == 2
+        getter = getattr(self.manager, getter_name)
+        for expected in expected_seq:
+            assert getter() == expected
+            
+    @pytest.mark.parametrize("kind, model, key", [
+        ("security", _SBER_SEC, "SBER"),
+        ("portfolio", _PORT1, 1),
+        ("position", _POS_SBER_P1, 1),
+    ])
+    def test_add_and_get(self, kind, model, key):
+        """Test adding and retrieving security, portfolio and position"""
+        getattr(self.manager, f"add_{kind}")(model)
+        
+        retrieved = getattr(self.manager, f"get_{kind}")(key)
+        assert retrieved == model
 
 
 class TestSecurityOperations:
     """Tests for security-related operations"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
-    def test_add_and_get_security(self):
-        """Test adding and retrieving security"""
-        security = Security(
-            secid="SBER",
-            name="ПАО Сбербанк",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        
-        # Add security
-        self.manager.add_security(security)
-        
-        # Retrieve security
-        retrieved = self.manager.get_security("SBER")
-        assert retrieved is not None
-        assert retrieved.secid == "SBER"
-        assert retrieved.name == "ПАО Сбербанк"
-        
     def test_get_nonexistent_security(self):
         """Test retrieving non-existent security"""
         result = self.manager.get_security("NONEXISTENT")
@@ -93,20 +173,11 @@ class TestSecurityOperations:
         
     def test_security_exists(self):
         """Test checking if security exists"""
-        security = Security(
-            secid="GAZP",
-            name="ПАО Газпром",
-            isin="RU0009024277",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        
         # Should not exist initially
         assert not self.manager.security_exists("GAZP")
         
         # Add security
-        self.manager.add_security(security)
+        self.manager.add_security(_GAZP_SEC)
         
         # Should exist now
         assert self.manager.security_exists("GAZP")
@@ -117,60 +188,27 @@ class TestSecurityOperations:
         assert len(self.manager.get_all_securities()) == 0
         
         # Add securities
-        security1 = Security(
-            secid="SBER",
-            name="ПАО Сбербанк",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        security2 = Security(
-            secid="GAZP",
-            name="ПАО Газпром",
-            isin="RU0009024277",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        
-        self.manager.add_security(security1)
-        self.manager.add_security(security2)
+        self.manager.add_security(_SBER_SEC)
+        self.manager.add_security(_GAZP_SEC)
         
         # Check all securities
         all_securities = self.manager.get_all_securities()
         assert len(all_securities) == 2
         
-        secids = [s.secid for s in all_securities]
+        secids = {s.secid for s in all_securities}
         assert "SBER" in secids
         assert "GAZP" in secids
         
     def test_update_existing_security(self):
         """Test updating existing security"""
-        security1 = Security(
-            secid="SBER",
-            name="ПАО Сбербанк",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        
-        security2 = Security(
-            secid="SBER",
-            name="ПАО Сбербанк (обновлен)",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
+        updated = _SBER_SEC.model_copy(update={"name": "ПАО Сбербанк (обновлен)"})
         
         # Add first version
-        self.manager.add_security(security1)
+        self.manager.add_security(_SBER_SEC)
         assert self.manager.get_security("SBER").name == "ПАО Сбербанк"
         
         # Update with second version
-        self.manager.add_security(security2)
+        self.manager.add_security(updated)
         assert self.manager.get_security("SBER").name == "ПАО Сбербанк (обновлен)"
         
         # Should still be only one security
@@ -180,41 +218,17 @@ class TestSecurityOperations:
 class TestQuoteOperations:
     """Tests for quote-related operations"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
     def test_add_and_get_quotes(self):
         """Test adding and retrieving quotes"""
-        from datetime import datetime
-        
-        quote1 = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 15, 10, 0, 0),
-            price=Decimal("252.0"),
-            volume=Decimal("1000000"),
-            bid=Decimal("251.5"),
-            ask=Decimal("252.5")
-        )
-        
-        quote2 = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 16, 10, 0, 0),
-            price=Decimal("257.0"),
-            volume=Decimal("1200000"),
-            bid=Decimal("256.5"),
-            ask=Decimal("257.5")
-        )
-        
         # Add quotes
-        self.manager.add_quote(quote1)
-        self.manager.add_quote(quote2)
+        self.manager.add_quote(_SBER_QUOTE_D1)
+        self.manager.add_quote(_SBER_QUOTE_D2)
         
         # Retrieve quotes
         quotes = self.manager.get_quotes("SBER")
         assert len(quotes) == 2
-        assert quotes[0].timestamp == datetime(2024, 1, 15, 10, 0, 0)
-        assert quotes[1].timestamp == datetime(2024, 1, 16, 10, 0, 0)
+        assert quotes[0].timestamp == _TS_D1
+        assert quotes[1].timestamp == _TS_D2
         
     def test_get_quotes_nonexistent_security(self):
         """Test getting quotes for non-existent security"""
@@ -223,64 +237,24 @@ class TestQuoteOperations:
         
     def test_get_latest_quote(self):
         """Test getting latest quote"""
-        from datetime import datetime
-        
         # No quotes initially
         assert self.manager.get_latest_quote("SBER") is None
         
-        quote1 = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 15, 10, 0, 0),
-            price=Decimal("252.0"),
-            volume=Decimal("1000000"),
-            bid=Decimal("251.5"),
-            ask=Decimal("252.5")
-        )
-        
-        quote2 = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 16, 10, 0, 0),
-            price=Decimal("257.0"),
-            volume=Decimal("1200000"),
-            bid=Decimal("256.5"),
-            ask=Decimal("257.5")
-        )
-        
         # Add quotes
-        self.manager.add_quote(quote1)
-        self.manager.add_quote(quote2)
+        self.manager.add_quote(_SBER_QUOTE_D1)
+        self.manager.add_quote(_SBER_QUOTE_D2)
         
         # Get latest quote
         latest = self.manager.get_latest_quote("SBER")
         assert latest is not None
-        assert latest.timestamp == datetime(2024, 1, 16, 10, 0, 0)
-        assert latest.price == Decimal("257.0")
+        assert latest.timestamp == _TS_D2
+        assert latest.price == _D["257.0"]
         
     def test_quotes_different_securities(self):
         """Test quotes for different securities"""
-        from datetime import datetime
-        
-        quote_sber = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 15, 10, 0, 0),
-            price=Decimal("252.0"),
-            volume=Decimal("1000000"),
-            bid=Decimal("251.5"),
-            ask=Decimal("252.5")
-        )
-        
-        quote_gazp = Quote(
-            secid="GAZP",
-            timestamp=datetime(2024, 1, 15, 10, 0, 0),
-            price=Decimal("152.0"),
-            volume=Decimal("2000000"),
-            bid=Decimal("151.5"),
-            ask=Decimal("152.5")
-        )
-        
         # Add quotes
-        self.manager.add_quote(quote_sber)
-        self.manager.add_quote(quote_gazp)
+        self.manager.add_quote(_SBER_QUOTE_D1)
+        self.manager.add_quote(_GAZP_QUOTE_D1)
         
         # Check separate security quotes
         sber_quotes = self.manager.get_quotes("SBER")
@@ -295,31 +269,6 @@ class TestQuoteOperations:
 class TestPortfolioOperations:
     """Tests for portfolio-related operations"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
-    def test_add_and_get_portfolio(self):
-        """Test adding and retrieving portfolio"""
-        portfolio = Portfolio(
-            id=1,
-            name="Test Portfolio",
-            description="Test portfolio description",
-            total_value=Decimal("100000"),
-            cash_balance=Decimal("10000"),
-            is_active=True
-        )
-        
-        # Add portfolio
-        self.manager.add_portfolio(portfolio)
-        
-        # Retrieve portfolio
-        retrieved = self.manager.get_portfolio(1)
-        assert retrieved is not None
-        assert retrieved.id == 1
-        assert retrieved.name == "Test Portfolio"
-        assert retrieved.total_value == Decimal("100000")
-        
     def test_get_nonexistent_portfolio(self):
         """Test retrieving non-existent portfolio"""
         result = self.manager.get_portfolio(999)
@@ -331,46 +280,20 @@ class TestPortfolioOperations:
         assert len(self.manager.get_all_portfolios()) == 0
         
         # Add portfolios
-        portfolio1 = Portfolio(
-            id=1,
-            name="Portfolio 1",
-            description="First portfolio",
-            total_value=Decimal("100000"),
-            cash_balance=Decimal("10000"),
-            is_active=True
-        )
-        portfolio2 = Portfolio(
-            id=2,
-            name="Portfolio 2",
-            description="Second portfolio",
-            total_value=Decimal("200000"),
-            cash_balance=Decimal("20000"),
-            is_active=True
-        )
-        
-        self.manager.add_portfolio(portfolio1)
-        self.manager.add_portfolio(portfolio2)
+        self.manager.add_portfolio(_PORT1)
+        self.manager.add_portfolio(_PORT2)
         
         # Check all portfolios
         all_portfolios = self.manager.get_all_portfolios()
         assert len(all_portfolios) == 2
         
-        portfolio_ids = [p.id for p in all_portfolios]
+        portfolio_ids = {p.id for p in all_portfolios}
         assert 1 in portfolio_ids
         assert 2 in portfolio_ids
         
     def test_portfolios_property(self):
         """Test portfolios property access"""
-        portfolio = Portfolio(
-            id=1,
-            name="Test Portfolio",
-            description="Test portfolio description",
-            total_value=Decimal("100000"),
-            cash_balance=Decimal("10000"),
-            is_active=True
-        )
-        
-        self.manager.add_portfolio(portfolio)
+        self.manager.add_portfolio(_PORT1)
         
         # Access via property
         portfolios_store = self.manager.portfolios
@@ -381,32 +304,6 @@ class TestPortfolioOperations:
 class TestPositionOperations:
     """Tests for position-related operations"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
-    def test_add_and_get_position(self):
-        """Test adding and retrieving position"""
-        position = Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            quantity=Decimal("100"),
-            avg_price=Decimal("250.0"),
-            market_price=Decimal("260.0")
-        )
-        
-        # Add position
-        self.manager.add_position(position)
-        
-        # Retrieve position
-        retrieved = self.manager.get_position(1)
-        assert retrieved is not None
-        assert retrieved.id == 1
-        assert retrieved.portfolio_id == 1
-        assert retrieved.secid == "SBER"
-        assert retrieved.quantity == Decimal("100")
-        
     def test_get_nonexistent_position(self):
         """Test retrieving non-existent position"""
         result = self.manager.get_position(999)
@@ -414,43 +311,16 @@ class TestPositionOperations:
         
     def test_get_positions_for_portfolio(self):
         """Test getting positions for specific portfolio"""
-        position1 = Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            quantity=Decimal("100"),
-            avg_price=Decimal("250.0"),
-            market_price=Decimal("260.0")
-        )
-        
-        position2 = Position(
-            id=2,
-            portfolio_id=1,
-            secid="GAZP",
-            quantity=Decimal("200"),
-            avg_price=Decimal("150.0"),
-            market_price=Decimal("155.0")
-        )
-        
-        position3 = Position(
-            id=3,
-            portfolio_id=2,
-            secid="SBER",
-            quantity=Decimal("50"),
-            avg_price=Decimal("255.0"),
-            market_price=Decimal("260.0")
-        )
-        
         # Add positions
-        self.manager.add_position(position1)
-        self.manager.add_position(position2)
-        self.manager.add_position(position3)
+        self.manager.add_position(_POS_SBER_P1)
+        self.manager.add_position(_POS_GAZP_P1)
+        self.manager.add_position(_POS_SBER_P2)
         
         # Get positions for portfolio 1
         portfolio1_positions = self.manager.get_positions_for_portfolio(1)
         assert len(portfolio1_positions) == 2
         
-        secids = [p.secid for p in portfolio1_positions]
+        secids = {p.secid for p in portfolio1_positions}
         assert "SBER" in secids
         assert "GAZP" in secids
         
@@ -463,38 +333,38 @@ class TestPositionOperations:
         empty_positions = self.manager.get_positions_for_portfolio(999)
         assert len(empty_positions) == 0
         
+    def test_readded_position_moves_between_portfolios(self):
+        """Test that re-adding a position under another portfolio moves it"""
+        self.manager.add_position(_POS_SBER_P1)
+        self.manager.add_position(_POS_SBER_P1.model_copy(update={"portfolio_id": 2}))
+        
+        assert self.manager.get_positions_for_portfolio(1) == []
+        assert [p.id for p in self.manager.get_positions_for_portfolio(2)] == [1]
+        
+    def test_bulk_repeated_position_moves_between_portfolios(self):
+        """Test that a bulk batch repeating a position id keeps only the last portfolio"""
+        self.manager.add_positions_bulk(
+            [_POS_SBER_P1, _POS_SBER_P1.model_copy(update={"portfolio_id": 2})]
+        )
+        
+        assert self.manager.get_positions_for_portfolio(1) == []
+        assert [p.id for p in self.manager.get_positions_for_portfolio(2)] == [1]
+        assert self.manager.get_position(1).portfolio_id == 2
+        
     def test_get_all_positions(self):
         """Test getting all positions"""
         # Initially empty
         assert len(self.manager.get_all_positions()) == 0
         
         # Add positions
-        position1 = Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            quantity=Decimal("100"),
-            avg_price=Decimal("250.0"),
-            market_price=Decimal("260.0")
-        )
-        
-        position2 = Position(
-            id=2,
-            portfolio_id=2,
-            secid="GAZP",
-            quantity=Decimal("200"),
-            avg_price=Decimal("150.0"),
-            market_price=Decimal("155.0")
-        )
-        
-        self.manager.add_position(position1)
-        self.manager.add_position(position2)
+        self.manager.add_position(_POS_SBER_P1)
+        self.manager.add_position(_POS_GAZP_P1)
         
         # Check all positions
         all_positions = self.manager.get_all_positions()
         assert len(all_positions) == 2
         
-        position_ids = [p.id for p in all_positions]
+        position_ids = {p.id for p in all_positions}
         assert 1 in position_ids
         assert 2 in position_ids
 
@@ -502,18 +372,8 @@ class TestPositionOperations:
 class TestTransactionOperations:
     """Tests for transaction-related operations (using mock Transaction)"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
     def create_mock_transaction(self, tx_id: int, portfolio_id: int, secid: str = "SBER"):
         """Create a mock transaction object"""
-        class MockTransaction:
-            def __init__(self, id: int, portfolio_id: int, secid: str):
-                self.id = id
-                self.portfolio_id = portfolio_id
-                self.secid = secid
-                
         return MockTransaction(tx_id, portfolio_id, secid)
         
     def test_add_and_get_transaction(self):
@@ -550,7 +410,7 @@ class TestTransactionOperations:
         portfolio1_transactions = self.manager.get_transactions_for_portfolio(1)
         assert len(portfolio1_transactions) == 2
         
-        secids = [t.secid for t in portfolio1_transactions]
+        secids = {t.secid for t in portfolio1_transactions}
         assert "SBER" in secids
         assert "GAZP" in secids
         
@@ -579,7 +439,7 @@ class TestTransactionOperations:
         all_transactions = self.manager.get_all_transactions()
         assert len(all_transactions) == 2
         
-        transaction_ids = [t.id for t in all_transactions]
+        transaction_ids = {t.id for t in all_transactions}
         assert 1 in transaction_ids
         assert 2 in transaction_ids
 
@@ -587,10 +447,6 @@ class TestTransactionOperations:
 class TestStrategyStores:
     """Tests for strategy-related stores"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
     def test_strategies_property_access(self):
         """Test accessing strategies store"""
         strategies_store = self.manager.strategies
@@ -615,56 +471,13 @@ class TestStrategyStores:
 class TestClearAll:
     """Tests for clear_all functionality"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
     def test_clear_all_functionality(self):
         """Test clearing all data"""
-        from datetime import datetime
-        
-        # Add some data
-        security = Security(
-            secid="SBER",
-            name="ПАО Сбербанк",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        
-        portfolio = Portfolio(
-            id=1,
-            name="Test Portfolio",
-            description="Test",
-            total_value=Decimal("100000"),
-            cash_balance=Decimal("10000"),
-            is_active=True
-        )
-        
-        position = Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            quantity=Decimal("100"),
-            avg_price=Decimal("250.0"),
-            market_price=Decimal("260.0")
-        )
-        
-        quote = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 15, 10, 0, 0),
-            price=Decimal("252.0"),
-            volume=Decimal("1000000"),
-            bid=Decimal("251.5"),
-            ask=Decimal("252.5")
-        )
-        
         # Add data to manager
-        self.manager.add_security(security)
-        self.manager.add_portfolio(portfolio)
-        self.manager.add_position(position)
-        self.manager.add_quote(quote)
+        self.manager.add_security(_SBER_SEC)
+        self.manager.add_portfolio(_PORT1)
+        self.manager.add_position(_POS_SBER_P1)
+        self.manager.add_quote(_SBER_QUOTE_D1)
         
         # Increment some ID counters
         self.manager.get_next_security_id()  # Should be 1
@@ -712,16 +525,7 @@ class TestDataManagerFactory:
         assert manager1 is manager2
         
         # Add some data to one instance
-        security = Security(
-            secid="SBER",
-            name="ПАО Сбербанк",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        
-        manager1.add_security(security)
+        manager1.add_security(_SBER_SEC)
         
         # Should be accessible from other reference
         assert manager2.security_exists("SBER")
@@ -736,176 +540,43 @@ class TestDataManagerFactory:
 class TestDataManagerIntegration:
     """Integration tests for DataManager"""
     
-    def setup_method(self):
-        """Setup method that runs before each test"""
-        self.manager = DataManager()
-        
-    def test_complete_portfolio_workflow(self):
-        """Test complete workflow with securities, quotes, portfolios, and positions"""
-        from datetime import datetime
-        
-        # Add security
-        security = Security(
-            secid="SBER",
-            name="ПАО Сбербанк",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        self.manager.add_security(security)
-        
-        # Add quotes
-        quote1 = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 15, 10, 0, 0),
-            price=Decimal("252.0"),
-            volume=Decimal("1000000"),
-            bid=Decimal("251.5"),
-            ask=Decimal("252.5")
-        )
-        
-        quote2 = Quote(
-            secid="SBER",
-            timestamp=datetime(2024, 1, 16, 10, 0, 0),
-            price=Decimal("257.0"),
-            volume=Decimal("1200000"),
-            bid=Decimal("256.5"),
-            ask=Decimal("257.5")
-        )
-        
-        self.manager.add_quote(quote1)
-        self.manager.add_quote(quote2)
-        
-        # Add portfolio
-        portfolio = Portfolio(
-            id=1,
-            name="Test Portfolio",
-            description="Test portfolio",
-            total_value=Decimal("100000"),
-            cash_balance=Decimal("10000"),
-            is_active=True
-        )
-        self.manager.add_portfolio(portfolio)
-        
-        # Add position
-        position = Position(
-            id=1,
-            portfolio_id=1,
-            secid="SBER",
-            quantity=Decimal("100"),
-            avg_price=Decimal("250.0"),
-            market_price=Decimal("257.0")  # Latest quote price
-        )
-        self.manager.add_position(position)
-        
-        # Verify the complete workflow
-        assert self.manager.security_exists("SBER")
-        assert len(self.manager.get_quotes("SBER")) == 2
-        assert self.manager.get_latest_quote("SBER").price == Decimal("257.0")
-        assert len(self.manager.get_all_portfolios()) == 1
-        assert len(self.manager.get_positions_for_portfolio(1)) == 1
-        
-        # Check position details
-        portfolio_positions = self.manager.get_positions_for_portfolio(1)
-        position = portfolio_positions[0]
-        assert position.secid == "SBER"
-        assert position.quantity == Decimal("100")
-        assert position.market_price == Decimal("257.0")
+    @pytest.fixture(scope="class")
+    def populated_manager(self):
+        """DataManager with the data of both workflows, built once per class"""
+        manager = DataManager()
         
-    def test_multiple_portfolios_and_positions(self):
-        """Test managing multiple portfolios with different positions"""
         # Add securities
-        sber = Security(
-            secid="SBER",
-            name="ПАО Сбербанк",
-            isin="RU0009029540",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
-        
-        gazp = Security(
-            secid="GAZP",
-            name="ПАО Газпром",
-            isin="RU0009024277",
-            engine="stock",
-            market="shares",
-            board="TQBR"
-        )
+        manager.add_security(_SBER_SEC)
+        manager.add_security(_GAZP_SEC)
         
-        self.manager.add_security(sber)
-        self.manager.add_security(gazp)
+        # Add quotes
+        manager.add_quote(_SBER_QUOTE_D1)
+        manager.add_quote(_SBER_QUOTE_D2)
         
         # Add portfolios
-        portfolio1 = Portfolio(
-            id=1,
-            name="Conservative Portfolio",
-            description="Conservative investment strategy",
-            total_value=Decimal("100000"),
-            cash_balance=Decimal("10000"),
-            is_active=True
-        )
-        
-        portfolio2 = Portfolio(
-            id=2,
-            name="Aggressive Portfolio",
-            description="Aggressive investment strategy",
-            total_value=Decimal("200000"),
-            cash_balance=Decimal("20000"),
-            is_active=True
-        )
-        
-        self.manager.add_portfolio(portfolio1)
-        self.manager.add_portfolio(portfolio2)
-        
-        # Add positions
-        positions = [
-            Position(
-                id=1,
-                portfolio_id=1,
-                secid="SBER",
-                quantity=Decimal("100"),
-                avg_price=Decimal("250.0"),
-                market_price=Decimal("257.0")
-            ),
-            Position(
-                id=2,
-                portfolio_id=1,
-                secid="GAZP",
-                quantity=Decimal("200"),
-                avg_price=Decimal("150.0"),
-                market_price=Decimal("155.0")
-            ),
-            Position(
-                id=3,
-                portfolio_id=2,
-                secid="SBER",
-                quantity=Decimal("500"),
-                avg_price=Decimal("255.0"),
-                market_price=Decimal("257.0")
-            )
-        ]
-        
-        for position in positions:
-            self.manager.add_position(position)
-            
-        # Verify portfolios and their positions
-        portfolio1_positions = self.manager.get_positions_for_portfolio(1)
-        portfolio2_positions = self.manager.get_positions_for_portfolio(2)
-        
-        assert len(portfolio1_positions) == 2  # SBER + GAZP
-        assert len(portfolio2_positions) == 1  # SBER only
-        
-        # Check specific position quantities
-        portfolio1_secids = [p.secid for p in portfolio1_positions]
-        assert "SBER" in portfolio1_secids
-        assert "GAZP" in portfolio1_secids
-        
-        portfolio2_secids = [p.secid for p in portfolio2_positions]
-        assert "SBER" in portfolio2_secids
-        assert "GAZP" not in portfolio2_secids
+        manager.add_portfolio(_PORT1)
+        manager.add_portfolio(_PORT2)
+        
+        # Add positions, SBER in portfolio 1 is priced at the latest quote
+        manager.add_positions_bulk([
+            _POS_SBER_P1.model_copy(update={"market_price": _D["257.0"]}),
+            _POS_GAZP_P1,
+            _POS_SBER_P2,
+        ])
+        return manager
+        
+    def test_complete_portfolio_workflow(self, populated_manager):
+        """Test complete workflow with securities, quotes, portfolios, and positions"""
+        # Position in portfolio 1 is priced at the latest SBER quote
+        latest = populated_manager.get_latest_quote("SBER")
+        position = populated_manager.get_positions_for_portfolio(1)[0]
+        assert position.secid == latest.secid
+        assert position.market_price == latest.price
         
-        # Verify total positions across all portfolios
-        all_positions = self.manager.get_all_positions()
-        assert len(all_positions) == 3
\ No newline at end of file
+    def test_multiple_portfolios_and_positions(self, populated_manager):
+        """Test managing multiple portfolios with different positions"""
+        # Each portfolio sees only its own positions
+        portfolio1_secids = {p.secid for p in populated_manager.get_positions_for_portfolio(1)}
+        portfolio2_secids = {p.secid for p in populated_manager.get_positions_for_portfolio(2)}
+        assert portfolio1_secids == {"SBER", "GAZP"}
+        assert portfolio2_secids == {"SBER"}
\ No newline at end of file
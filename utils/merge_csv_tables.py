@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import numpy as np
 import pandas as pd
 import argparse
 import sys
@@ -22,8 +23,16 @@ def find_table_sections(df: pd.DataFrame) -> List[Tuple[str, int, int]]:
     current_section = None
     current_start = None
 
-    for i, row in df.iterrows():
-        cell_value = str(row.iloc[0]) if pd.notna(row.iloc[0]) else ""
+    # Значения первой колонки строками (пустые ячейки -> "") и номера строк
+    # с заголовками и итогами: цикл идет только по ним, а не по всем строкам
+    first_col = df.iloc[:, 0]
+    first_col = first_col.where(first_col.notna(), "").astype(str)
+    is_header = first_col == header_pattern
+    is_total = first_col.str.contains("Итого по (?:разделу|счету)")
+    cells = first_col.tolist()
+
+    for i in np.flatnonzero((is_header | is_total).to_numpy()).tolist():
+        cell_value = cells[i]
 
         if cell_value == header_pattern:
             if current_section is not None and current_start is not None:
@@ -32,9 +41,7 @@ def find_table_sections(df: pd.DataFrame) -> List[Tuple[str, int, int]]:
             section_name = "Unknown"
 
             if i > 0:
-                prev_cell = (
-                    str(df.iloc[i - 1, 0]) if pd.notna(df.iloc[i - 1, 0]) else ""
-                )
+                prev_cell = cells[i - 1]
                 if prev_cell and len(prev_cell.strip()) > 0:
                     section_name = prev_cell.strip()
                     if section_name.startswith('"') and section_name.endswith('"'):
@@ -42,9 +49,7 @@ def find_table_sections(df: pd.DataFrame) -> List[Tuple[str, int, int]]:
                 else:
                     # Если в предыдущей строке пусто, ищем дальше
                     for j in range(max(0, i - 3), i):
-                        prev_cell = (
-                            str(df.iloc[j, 0]) if pd.notna(df.iloc[j, 0]) else ""
-                        )
+                        prev_cell = cells[j]
                         if (
                             prev_cell
                             and not prev_cell.startswith("Эмитент")
@@ -72,7 +77,7 @@ def find_table_sections(df: pd.DataFrame) -> List[Tuple[str, int, int]]:
     if current_section is not None and current_start is not None:
         last_data_row = len(df) - 1
         for j in range(len(df) - 1, current_start - 1, -1):
-            row_value = str(df.iloc[j, 0]) if pd.notna(df.iloc[j, 0]) else ""
+            row_value = cells[j]
             if (
                 row_value
                 and not row_value.startswith("Итого")
@@ -160,15 +165,8 @@ def analyze_csv_structure(df: pd.DataFrame) -> None:
     logger.info(f"\nОбщее количество записей для обработки: {total_records}")
 
 
-def merge_csv_tables(input_file: str, output_file: str = None) -> str:
-    """Основная функция объединения таблиц."""
-
-    input_path = Path(input_file)
-    if not input_path.exists():
-        raise FileNotFoundError(f"Файл не найден: {input_file}")
-
-    if output_file is None:
-        output_file = str(input_path.with_suffix("").with_suffix("")) + "_clean.csv"
+def build_merged_frame(input_file: str) -> pd.DataFrame:
+    """Собирает секции CSV файла в одну таблицу без записи на диск."""
 
     logger.info(f"Читаем файл: {input_file}")
     df = pd.read_csv(input_file, encoding="utf-8")
@@ -181,14 +179,27 @@ def merge_csv_tables(input_file: str, output_file: str = None) -> str:
 
     logger.info("\nОбъединяем таблицы...")
     merged_df = extract_table_data(df, sections)
+    logger.info(f"Объединено {len(merged_df)} записей из {len(sections)} секций")
+
+    return merged_df
+
+
+def merge_csv_tables(input_file: str, output_file: str = None) -> str:
+    """Основная функция объединения таблиц."""
+
+    input_path = Path(input_file)
+    if not input_path.exists():
+        raise FileNotFoundError(f"Файл не найден: {input_file}")
+
+    if output_file is None:
+        output_file = str(input_path.with_suffix("").with_suffix("")) + "_clean.csv"
+
+    merged_df = build_merged_frame(input_file)
 
     logger.info(f"Сохраняем в файл: {output_file}")
     merged_df.to_csv(output_file, encoding="utf-8", index=False)
 
-    logger.info(
-        f"\nГотово! Объединено {len(merged_df)} записей из {len(sections)} секций"
-    )
-    logger.info(f"Результат сохранён в: {output_file}")
+    logger.info(f"\nГотово! Результат сохранён в: {output_file}")
 
     return output_file
 
@@ -12,12 +12,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# calamine из extra "calamine" читает xls/xlsx в разы быстрее openpyxl;
+# без него pandas выберет движок сам
+try:
+    import python_calamine  # noqa: F401
+
+    EXCEL_ENGINE: Optional[str] = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
 
 def convert_xls_to_csv(
     input_file: str,
     output_file: Optional[str] = None,
     sheet_name: str = "Account_Statement_auto_EXC",
     encoding: str = "utf-8-sig",
+    excel_file: Optional[pd.ExcelFile] = None,
 ) -> str:
     """Конвертирует XLS файл в CSV формат."""
 
@@ -31,7 +41,11 @@ def convert_xls_to_csv(
 
     try:
         logger.info(f"Читаем XLS файл: {input_file}")
-        df = pd.read_excel(input_file, sheet_name=sheet_name)
+        # Уже открытый ExcelFile того же файла читается без повторного разбора книги
+        if excel_file is not None:
+            df = excel_file.parse(sheet_name)
+        else:
+            df = pd.read_excel(input_file, sheet_name=sheet_name, engine=EXCEL_ENGINE)
 
         logger.info(f"Найдено {len(df)} строк и {len(df.columns)} колонок")
 
@@ -57,7 +71,7 @@ def analyze_xls_structure(
     try:
         logger.info(f"\n=== АНАЛИЗ СТРУКТУРЫ ФАЙЛА {input_file} ===")
 
-        df = pd.read_excel(input_file, sheet_name=sheet_name)
+        df = pd.read_excel(input_file, sheet_name=sheet_name, engine=EXCEL_ENGINE)
 
         logger.info(f"Размер данных: {len(df)} строк x {len(df.columns)} колонок")
         logger.info(f"Лист: {sheet_name}")